@@ -1,7 +1,10 @@
+import urllib.parse
 import pytest
 from selenium import webdriver
+from selenium.webdriver.common.by import By
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from main import EasyApplyLinkedin
+from fake_webdriver import FakeWebDriver, load_scenario
 
 @pytest.fixture
 def setup_browser():
@@ -109,5 +112,51 @@ def test_find_offers(setup_bot):
     setup_bot.find_offers()
     assert len(setup_bot.applied_companies) > 0
 
+def run_page_scripts(driver):
+    details = driver.execute_script(EasyApplyLinkedin.JOB_DETAILS_SCRIPT)
+    job_list_container = driver.find_element(By.CLASS_NAME, "scaffold-layout__list-container")
+    rendered_cards = driver.execute_script(EasyApplyLinkedin.RENDER_JOB_CARDS_SCRIPT, job_list_container)
+    job_cards = driver.execute_script(EasyApplyLinkedin.JOB_CARDS_SCRIPT, job_list_container)
+    modal = driver.find_element(By.CSS_SELECTOR, "div.jobs-easy-apply-modal")
+    step = driver.execute_script(EasyApplyLinkedin.EASY_APPLY_STEP_SCRIPT, modal)
+    answers = {
+        "Years of experience with React": "5",
+        "Are you legally authorized to work in Switzerland?": "yes",
+        "Languages": {"English": True, "German": False},
+        "Notice period": "1 month",
+        "Cover letter": "I would love to join your team.",
+    }
+    filled = driver.execute_script(
+        EasyApplyLinkedin.FORM_PLAN_SCRIPT,
+        [[field["element"], field["input"], field["kind"], answers[field["label"]]] for field in step["fields"]],
+    )
+    filled_step = driver.execute_script(EasyApplyLinkedin.EASY_APPLY_STEP_SCRIPT, modal)
+    return {
+        "details": details,
+        "rendered_cards": rendered_cards,
+        "job_cards": [
+            {"id": job_card["id"], "title": job_card["title"], "text": " ".join(job_card["text"].split())}
+            for job_card in job_cards
+        ],
+        "step": [step["kind"], step["progress"], step["button"] is not None],
+        "fields": [
+            [field["label"], field["kind"], field["value"], field["typeahead"]] for field in step["fields"]
+        ],
+        "filled": filled,
+        "filled_values": [field["value"] for field in filled_step["fields"]],
+        "checked": [
+            option.is_selected()
+            for option in modal.find_elements(By.CSS_SELECTOR, "input[type='radio'], input[type='checkbox']")
+        ],
+    }
+
+def test_page_scripts_match_fake_webdriver(setup_browser):
+    fake_driver = FakeWebDriver(load_scenario("scenarios/multi_step_apply.json"), script_source=EasyApplyLinkedin)
+    fake_driver.get("https://www.linkedin.com/jobs/search/?geoId=106693272")
+    fake_driver.current_window.show_job("101")
+    fake_driver.current_window.show_step(1)
+    setup_browser.get("data:text/html;charset=utf-8," + urllib.parse.quote(fake_driver.page_source))
+    assert run_page_scripts(setup_browser) == run_page_scripts(fake_driver)
+
 if __name__ == "__main__":
     pytest.main()
@@ -0,0 +1,948 @@
+"""In-process stand-in for the Selenium WebDriver used by scenario_tests.py.
+
+The LinkedIn pages are modelled as a small DOM built from a scenario file, and
+every command goes through FakeWebDriver.execute so tests can count them.
+
+The bot's JavaScript snippets (RENDER_JOB_CARDS_SCRIPT, JOB_CARDS_SCRIPT,
+JOB_DETAILS_SCRIPT, EASY_APPLY_STEP_SCRIPT and FORM_PLAN_SCRIPT) are matched by
+their source text and re-implemented in Python; the JavaScript itself never runs
+here, so a broken snippet can still pass the scenario tests. e2e_tests.py runs the real snippets
+in Firefox against this DOM (via page_source) and compares both results.
+"""
+import html
+import json
+import re
+import urllib.parse
+from collections import Counter
+from contextlib import ExitStack
+from functools import lru_cache
+from pathlib import Path
+from unittest.mock import patch
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSelectorException,
+    JavascriptException,
+    NoSuchElementException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+
+BASE_URL = "https://www.linkedin.com"
+SPECIAL_KEYS = re.compile(r"[\ue000-\uf8ff]")
+COMPOUND_PART = re.compile(
+    r"""([a-zA-Z][\w-]*|\*)|\.([\w-]+)|#([\w-]+)|\[([\w-]+)(?:=(?:'([^']*)'|"([^"]*)"|([\w-]+)))?\]"""
+)
+ABSOLUTE_XPATH = re.compile(r"//(\w+)\[@([\w-]+)='([^']*)'\]")
+SIBLING_XPATH = re.compile(r"\./following-sibling::(\w+)")
+
+
+def load_scenario(path):
+    with Path(path).open() as file:
+        return json.load(file)
+
+
+def split_selector(selector, separators):
+    parts, current, quote = [], "", None
+    for char in selector:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"":
+            quote = char
+        elif char in separators:
+            parts.append(current)
+            current = ""
+            continue
+        current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+@lru_cache(maxsize=None)
+def parse_selector(selector):
+    chains = []
+    for group in split_selector(selector, ","):
+        chain = []
+        for compound in split_selector(group, " \t\n"):
+            tag, classes, attributes = None, set(), []
+            position = 0
+            while position < len(compound):
+                match = COMPOUND_PART.match(compound, position)
+                if match is None:
+                    raise InvalidSelectorException(f"Selector not modelled by FakeWebDriver: {selector}")
+                name, class_name, element_id, attribute, *values = match.groups()
+                if name:
+                    tag = None if name == "*" else name.lower()
+                elif class_name:
+                    classes.add(class_name)
+                elif element_id:
+                    attributes.append(("id", element_id))
+                else:
+                    attributes.append((attribute, next((value for value in values if value is not None), None)))
+                position = match.end()
+            chain.append((tag, frozenset(classes), tuple(attributes)))
+        chains.append(tuple(chain))
+    return tuple(chains)
+
+
+class FakeClock:
+    def __init__(self, epoch=1_700_000_000.0):
+        self.epoch = epoch
+        self.elapsed = 0.0
+
+    def sleep(self, seconds):
+        self.elapsed += max(seconds, 0)
+
+    def monotonic(self):
+        return self.elapsed
+
+    def perf_counter(self):
+        return self.elapsed
+
+    def time(self):
+        return self.epoch + self.elapsed
+
+    def patch(self, *modules):
+        stack = ExitStack()
+        for module in modules:
+            stack.enter_context(patch(f"{module}.time", self))
+        return stack
+
+
+class FakeElement:
+    def __init__(self, driver, tag, attributes=None, text="", children=(), on_click=None, on_submit=None):
+        self.driver = driver
+        self.tag = tag
+        self.attributes = dict(attributes or {})
+        self.own_text = text
+        self.on_click = on_click
+        self.on_submit = on_submit
+        self.value = self.attributes.pop("value", "") if tag in ("input", "textarea") else ""
+        if tag == "input" and self.attributes.get("type") in ("radio", "checkbox") and not self.value:
+            self.value = "on"
+        self.checked = False
+        self.attached = True
+        self.parent = None
+        self.children = []
+        for child in children:
+            self.append(child)
+        if tag == "select" and self.children:
+            self.value = self.children[0].get_property("value")
+
+    def __repr__(self):
+        return f"<FakeElement {self.tag} {self.attributes}>"
+
+    def append(self, child):
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    def detach(self):
+        for element in self.iter():
+            element.attached = False
+
+    def iter(self):
+        yield self
+        for child in self.children:
+            yield from child.iter()
+
+    def descendants(self):
+        for child in self.children:
+            yield from child.iter()
+
+    def root(self):
+        element = self
+        while element.parent is not None:
+            element = element.parent
+        return element
+
+    @property
+    def classes(self):
+        return set(self.attributes.get("class", "").split())
+
+    @property
+    def inner_text(self):
+        parts = [self.own_text] + [child.inner_text for child in self.children]
+        return "\n".join(part for part in parts if part)
+
+    def get_property(self, name):
+        if name == "value":
+            if self.tag == "option":
+                return self.attributes.get("value", self.own_text)
+            return self.value
+        if name == "checked":
+            return self.checked
+        if name == "type":
+            return self.attributes.get("type", "text")
+        return self.attributes.get(name)
+
+    def matches(self, compound):
+        tag, classes, attributes = compound
+        return (
+            (tag is None or self.tag == tag)
+            and classes <= self.classes
+            and all(
+                name in self.attributes and (value is None or self.attributes[name] == value)
+                for name, value in attributes
+            )
+        )
+
+    def matches_chain(self, chain):
+        if not self.matches(chain[-1]):
+            return False
+        ancestor = self.parent
+        for compound in reversed(chain[:-1]):
+            while ancestor is not None and not ancestor.matches(compound):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            ancestor = ancestor.parent
+        return True
+
+    def select(self, selector):
+        chains = parse_selector(selector)
+        return [element for element in self.descendants() if any(element.matches_chain(chain) for chain in chains)]
+
+    def select_one(self, selector):
+        return next(iter(self.select(selector)), None)
+
+    def to_html(self):
+        attributes = dict(self.attributes)
+        if self.tag == "input" and self.value:
+            attributes["value"] = self.value
+        if self.checked:
+            attributes["checked"] = ""
+        if self.tag == "option" and self.parent is not None and self.parent.value == self.get_property("value"):
+            attributes["selected"] = ""
+        rendered_attributes = "".join(
+            f' {name}="{html.escape(str(value), quote=True)}"' for name, value in attributes.items()
+        )
+        if self.tag == "input":
+            return f"<input{rendered_attributes}>"
+        content = html.escape(self.value if self.tag == "textarea" else self.own_text)
+        content += "".join(child.to_html() for child in self.children)
+        return f"<{self.tag}{rendered_attributes}>{content}</{self.tag}>"
+
+    def following_siblings(self):
+        if self.parent is None:
+            return []
+        siblings = self.parent.children
+        return siblings[siblings.index(self) + 1:]
+
+    @property
+    def tag_name(self):
+        return self.driver.execute(Command.GET_ELEMENT_TAG_NAME, {"element": self})
+
+    @property
+    def text(self):
+        return self.driver.execute(Command.GET_ELEMENT_TEXT, {"element": self})
+
+    def get_attribute(self, name):
+        return self.driver.execute(Command.GET_ELEMENT_ATTRIBUTE, {"element": self, "name": name})
+
+    def is_displayed(self):
+        return self.driver.execute("isElementDisplayed", {"element": self})
+
+    def is_selected(self):
+        return self.driver.execute(Command.IS_ELEMENT_SELECTED, {"element": self})
+
+    def click(self):
+        self.driver.execute(Command.CLICK_ELEMENT, {"element": self})
+
+    def clear(self):
+        self.driver.execute(Command.CLEAR_ELEMENT, {"element": self})
+
+    def send_keys(self, *value):
+        self.driver.execute(Command.SEND_KEYS_TO_ELEMENT, {"element": self, "text": "".join(map(str, value))})
+
+    def find_element(self, by=By.ID, value=None):
+        return self.driver.execute(Command.FIND_CHILD_ELEMENT, {"element": self, "using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None):
+        return self.driver.execute(Command.FIND_CHILD_ELEMENTS, {"element": self, "using": by, "value": value})
+
+
+class FakeWindow:
+    COMPONENTS = ("form", "nav", "search_box", "banner", "list", "pagination", "details", "modal", "dialog")
+
+    def __init__(self, driver, handle):
+        self.driver = driver
+        self.handle = handle
+        self.url = "about:blank"
+        self.document = FakeElement(driver, "html")
+        self.components = {}
+        self.pages = []
+        self.page = 1
+        self.job_id = None
+        self.step = 0
+
+    def set_component(self, name, element):
+        previous = self.components.get(name)
+        if previous is not None and previous is not element:
+            previous.detach()
+        self.components[name] = element
+        self.document.children = []
+        for component_name in self.COMPONENTS:
+            component = self.components.get(component_name)
+            if component is not None:
+                self.document.append(component)
+
+    def navigate(self, url):
+        self.driver.history.append(url)
+        for name in self.COMPONENTS:
+            self.set_component(name, None)
+        self.url = url
+        self.job_id = None
+        path = urllib.parse.urlparse(url).path
+        job_view = re.match(r"/jobs/view/(\w+)", path)
+        if path.startswith("/login"):
+            self.set_component("form", self.driver.render_login_form(self))
+            return
+        if url != "about:blank":
+            self.set_component("nav", self.driver.render_nav(self))
+        if path.rstrip("/") == "/jobs":
+            self.set_component("search_box", self.driver.render_search_box(self))
+        elif path.startswith("/jobs/search") or path.startswith("/jobs/collections"):
+            self.pages = self.driver.find_search_pages(url)
+            self.show_page(1)
+        elif job_view:
+            self.show_job(job_view.group(1))
+
+    def show_page(self, page):
+        self.page = page
+        self.set_component("details", None)
+        if not self.pages:
+            self.set_component("banner", self.driver.element(
+                "div", {"class": "jobs-search-no-results-banner"}, "No matching jobs found."
+            ))
+            return
+        self.set_component("list", self.driver.render_job_list(self, self.pages[page - 1]))
+        self.set_component("pagination", self.driver.render_pagination(self, len(self.pages)))
+
+    def show_job(self, job_id):
+        self.job_id = job_id
+        self.set_component("details", self.driver.render_job_details(self, job_id))
+
+    def show_step(self, step):
+        self.step = step
+        self.set_component("modal", self.driver.render_modal(self, self.job_id, step))
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, window_name):
+        self.driver.execute(Command.SWITCH_TO_WINDOW, {"handle": window_name})
+
+    def new_window(self, type_hint=None):
+        handle = self.driver.execute(Command.NEW_WINDOW, {"type": type_hint})
+        self.window(handle)
+
+
+class FakeWebDriver:
+    FAULTS = ("staleCard", "interceptedClick", "detailsTimeout", "modalTimeout", "modalDisappears")
+
+    def __init__(self, scenario, script_source=None):
+        self.scenario = scenario
+        self.jobs = {str(job_id): job for job_id, job in scenario.get("jobs", {}).items()}
+        self.faults = {job_id: list(job.get("faults", [])) for job_id, job in self.jobs.items()}
+        self.applied = set()
+        self.clock = FakeClock()
+        self.commands = []
+        self.history = []
+        self.selected_jobs = []
+        self.switch_to = FakeSwitchTo(self)
+        self.windows = {}
+        self.window_count = 0
+        self.current_window = self.open_window()
+        self.scripts = {
+            "arguments[0].click();": self.script_click,
+            "arguments[0].scrollIntoView(true);": lambda element: None,
+            "window.location.href = arguments[0];": lambda url: self.current_window.navigate(url),
+        }
+        for name, handler in (
+            ("JOB_DETAILS_SCRIPT", self.script_job_details),
+            ("RENDER_JOB_CARDS_SCRIPT", lambda container: len(container.select("li"))),
+            ("JOB_CARDS_SCRIPT", self.script_job_cards),
+            ("EASY_APPLY_STEP_SCRIPT", self.script_easy_apply_step),
+            ("FORM_PLAN_SCRIPT", self.script_form_plan),
+        ):
+            script = getattr(script_source, name, None)
+            if script is not None:
+                self.scripts[script] = handler
+        self.handlers = {
+            Command.GET: lambda url: self.current_window.navigate(url),
+            Command.GET_CURRENT_URL: lambda: self.current_window.url,
+            Command.GET_PAGE_SOURCE: lambda: (
+                "<!DOCTYPE html><html><body>"
+                + "".join(child.to_html() for child in self.current_window.document.children)
+                + "</body></html>"
+            ),
+            Command.W3C_GET_CURRENT_WINDOW_HANDLE: lambda: self.current_window.handle,
+            Command.W3C_GET_WINDOW_HANDLES: lambda: list(self.windows),
+            Command.SWITCH_TO_WINDOW: self.command_switch_to_window,
+            Command.NEW_WINDOW: lambda type: self.open_window().handle,
+            Command.REFRESH: lambda: None,
+            Command.ADD_COOKIE: lambda cookie: None,
+            Command.CLOSE: self.command_close,
+            Command.QUIT: self.command_quit,
+            Command.FIND_ELEMENT: lambda using, value: self.find(self.current_window.document, using, value),
+            Command.FIND_ELEMENTS: lambda using, value: self.locate(self.current_window.document, using, value),
+            Command.FIND_CHILD_ELEMENT: self.find,
+            Command.FIND_CHILD_ELEMENTS: self.locate,
+            Command.W3C_EXECUTE_SCRIPT: self.command_execute_script,
+            Command.CLICK_ELEMENT: self.command_click,
+            Command.CLEAR_ELEMENT: self.command_clear,
+            Command.SEND_KEYS_TO_ELEMENT: self.command_send_keys,
+            Command.GET_ELEMENT_TEXT: lambda element: element.inner_text,
+            Command.GET_ELEMENT_ATTRIBUTE: lambda element, name: element.get_property(name),
+            Command.GET_ELEMENT_TAG_NAME: lambda element: element.tag,
+            Command.IS_ELEMENT_SELECTED: lambda element: element.checked,
+            "isElementDisplayed": lambda element: True,
+        }
+
+    @classmethod
+    def from_file(cls, path, script_source=None):
+        return cls(load_scenario(path), script_source)
+
+    @property
+    def command_counts(self):
+        return Counter(self.commands)
+
+    def execute(self, driver_command, params=None):
+        self.commands.append(driver_command)
+        if self.current_window is None and driver_command != Command.QUIT:
+            raise NoSuchWindowException("No browsing context is selected")
+        params = dict(params or {})
+        self.check_attached(params.get("element"))
+        return self.handlers[driver_command](**params)
+
+    def check_attached(self, value):
+        if isinstance(value, FakeElement) and not value.attached:
+            raise StaleElementReferenceException(f"{value!r} is no longer attached to the DOM")
+        if isinstance(value, (list, tuple)):
+            for item in value:
+                self.check_attached(item)
+
+    def get(self, url):
+        self.execute(Command.GET, {"url": url})
+
+    @property
+    def current_url(self):
+        return self.execute(Command.GET_CURRENT_URL)
+
+    @property
+    def page_source(self):
+        return self.execute(Command.GET_PAGE_SOURCE)
+
+    @property
+    def current_window_handle(self):
+        return self.execute(Command.W3C_GET_CURRENT_WINDOW_HANDLE)
+
+    @property
+    def window_handles(self):
+        return self.execute(Command.W3C_GET_WINDOW_HANDLES)
+
+    def refresh(self):
+        self.execute(Command.REFRESH)
+
+    def add_cookie(self, cookie_dict):
+        self.execute(Command.ADD_COOKIE, {"cookie": cookie_dict})
+
+    def close(self):
+        self.execute(Command.CLOSE)
+
+    def quit(self):
+        self.execute(Command.QUIT)
+
+    def find_element(self, by=By.ID, value=None):
+        return self.execute(Command.FIND_ELEMENT, {"using": by, "value": value})
+
+    def find_elements(self, by=By.ID, value=None):
+        return self.execute(Command.FIND_ELEMENTS, {"using": by, "value": value})
+
+    def execute_script(self, script, *args):
+        return self.execute(Command.W3C_EXECUTE_SCRIPT, {"script": script, "args": list(args)})
+
+    def open_window(self):
+        self.window_count += 1
+        window = FakeWindow(self, f"window-{self.window_count}")
+        self.windows[window.handle] = window
+        return window
+
+    def command_switch_to_window(self, handle):
+        if handle not in self.windows:
+            raise NoSuchWindowException(f"No window with handle {handle}")
+        self.current_window = self.windows[handle]
+
+    def command_close(self):
+        self.windows.pop(self.current_window.handle).document.detach()
+        self.current_window = None
+
+    def command_quit(self):
+        for window in self.windows.values():
+            window.document.detach()
+        self.windows = {}
+        self.current_window = None
+
+    def command_execute_script(self, script, args):
+        self.check_attached(args)
+        handler = self.scripts.get(script)
+        if handler is None:
+            raise JavascriptException(f"Script not modelled by FakeWebDriver: {script.strip()[:60]}")
+        return handler(*args)
+
+    def locate(self, element, using, value):
+        if using == By.XPATH:
+            absolute = ABSOLUTE_XPATH.fullmatch(value)
+            if absolute:
+                tag, attribute, attribute_value = absolute.groups()
+                return element.root().select(f"{tag}[{attribute}='{attribute_value}']")
+            sibling = SIBLING_XPATH.fullmatch(value)
+            if sibling:
+                return [candidate for candidate in element.following_siblings() if candidate.tag == sibling.group(1)]
+            raise InvalidSelectorException(f"XPath not modelled by FakeWebDriver: {value}")
+        if using == By.LINK_TEXT:
+            return [candidate for candidate in element.descendants() if candidate.tag == "a" and candidate.inner_text == value]
+        selectors = {
+            By.CSS_SELECTOR: value,
+            By.CLASS_NAME: f".{value}",
+            By.TAG_NAME: value,
+            By.NAME: f"[name='{value}']",
+            By.ID: f"#{value}",
+        }
+        if using not in selectors:
+            raise InvalidSelectorException(f"Locator strategy not modelled by FakeWebDriver: {using}")
+        return element.select(selectors[using])
+
+    def find(self, element, using, value):
+        found = self.locate(element, using, value)
+        if not found:
+            raise NoSuchElementException(f"Unable to locate element: {value}")
+        return found[0]
+
+    def command_click(self, element):
+        self.dispatch_click(element)
+
+    def command_clear(self, element):
+        element.value = ""
+
+    def command_send_keys(self, element, text):
+        if element.tag in ("input", "textarea"):
+            if element.get_property("type") == "file":
+                element.value = SPECIAL_KEYS.sub("", text)
+            else:
+                element.value += SPECIAL_KEYS.sub("", text)
+        if Keys.RETURN in text and element.on_submit is not None:
+            element.on_submit(element)
+
+    def dispatch_click(self, element):
+        input_type = element.get_property("type")
+        if element.tag == "input" and input_type == "checkbox":
+            element.checked = not element.checked
+        elif element.tag == "input" and input_type == "radio":
+            fieldset = element.parent
+            while fieldset is not None and fieldset.tag != "fieldset":
+                fieldset = fieldset.parent
+            for radio in (fieldset or element.parent).select("input[type='radio']"):
+                radio.checked = radio is element
+        elif element.tag == "option" and element.parent is not None:
+            element.parent.value = element.get_property("value")
+        target = element
+        while target is not None:
+            if target.on_click is not None:
+                target.on_click(target)
+                return
+            target = target.parent
+
+    def take_fault(self, job_id, fault):
+        faults = self.faults.get(job_id, [])
+        if fault in faults:
+            faults.remove(fault)
+            return True
+        return False
+
+    def element(self, tag, attributes=None, text="", children=(), on_click=None, on_submit=None):
+        return FakeElement(self, tag, attributes, text, children, on_click, on_submit)
+
+    def get_job(self, job_id):
+        job = {
+            "title": f"Job {job_id}",
+            "company": f"Company {job_id}",
+            "location": "Remote",
+            "posted": "1 day ago",
+            "description": f"Description of job {job_id}.",
+            "easyApply": True,
+            "form": None,
+        }
+        job.update(self.jobs.get(job_id, {}))
+        return job
+
+    def get_steps(self, job_id):
+        form = self.get_job(job_id)["form"]
+        return self.scenario.get("forms", {}).get(form) or [{"button": "submit", "fields": []}]
+
+    def find_search_pages(self, url):
+        parsed = urllib.parse.urlparse(url)
+        geo_id = urllib.parse.parse_qs(parsed.query).get("geoId", [None])[0]
+        for search in self.scenario.get("searches", []):
+            if "geoId" in search and search["geoId"] == geo_id:
+                return [[str(job_id) for job_id in page] for page in search.get("pages", []) if page]
+            if "collection" in search and parsed.path.rstrip("/").endswith(f"/{search['collection']}"):
+                return [[str(job_id) for job_id in page] for page in search.get("pages", []) if page]
+        return []
+
+    def render_login_form(self, window):
+        def submit(element):
+            password = self.scenario.get("login", {}).get("password")
+            if password is None or element.value == password:
+                window.navigate(f"{BASE_URL}/feed/")
+
+        return self.element("form", {"class": "login__form"}, children=[
+            self.element("input", {"name": "session_key", "type": "text"}),
+            self.element("input", {"name": "session_password", "type": "password"}, on_submit=submit),
+        ])
+
+    def render_nav(self, window):
+        return self.element("nav", {"class": "global-nav"}, children=[
+            self.element("a", {"href": "/jobs/"}, "Jobs", on_click=lambda element: window.navigate(f"{BASE_URL}/jobs/")),
+        ])
+
+    def render_search_box(self, window):
+        keywords = self.element("input", {"aria-label": "Search by title, skill, or company", "type": "text"})
+        location = self.element("input", {"aria-label": "City, state, or zip code", "type": "text"})
+
+        def submit(element):
+            params = {"keywords": keywords.value}
+            geo_id = self.scenario.get("geoIds", {}).get(location.value)
+            if geo_id:
+                params["geoId"] = geo_id
+            window.navigate(f"{BASE_URL}/jobs/search/?{urllib.parse.urlencode(params)}")
+
+        keywords.on_submit = submit
+        return self.element("div", {"class": "jobs-search-box"}, children=[keywords, location])
+
+    def render_job_list(self, window, job_ids):
+        cards = []
+        for job_id in job_ids:
+            job = self.get_job(job_id)
+            metadata = [self.element("div", {"class": "job-card-container__metadata-item"}, job["location"])]
+            if "applicants" in job:
+                metadata.append(self.element("div", {"class": "job-card-container__footer-item"}, f"{job['applicants']} applicants"))
+            cards.append(self.element("li", {"data-occludable-job-id": job_id}, on_click=self.click_job_card, children=[
+                self.element("div", {"class": "job-card-container"}, children=[
+                    self.element("a", {"class": "job-card-container__link"}, job["title"]),
+                    self.element("div", {"class": "artdeco-entity-lockup__subtitle"}, children=[
+                        self.element("span", {"class": "job-card-container__primary-description"}, job["company"]),
+                    ]),
+                    *metadata,
+                ]),
+            ]))
+        return self.element("div", {"class": "scaffold-layout__list-container"}, children=[
+            self.element("ul", children=cards),
+        ])
+
+    def render_pagination(self, window, page_count):
+        return self.element("ul", {"class": "artdeco-pagination__pages"}, children=[
+            self.element("li", children=[
+                self.element(
+                    "button",
+                    {"aria-label": f"Page {page}"},
+                    str(page),
+                    on_click=lambda element, page=page: window.show_page(page),
+                ),
+            ])
+            for page in range(1, page_count + 1)
+        ])
+
+    def render_job_details(self, window, job_id):
+        job = self.get_job(job_id)
+        primary_description = [job["location"], job["posted"]]
+        if "applicants" in job:
+            primary_description.append(f"{job['applicants']} applicants")
+        children = [
+            self.element("h1", {"class": "job-details-jobs-unified-top-card__job-title"}, job["title"]),
+            self.element("div", {"class": "job-details-jobs-unified-top-card__company-name"}, job["company"]),
+            self.element(
+                "div",
+                {"class": "job-details-jobs-unified-top-card__primary-description-container"},
+                " · ".join(primary_description),
+            ),
+        ]
+        if job["easyApply"] and job_id not in self.applied:
+            children.append(self.element(
+                "button",
+                {"class": "jobs-apply-button artdeco-button artdeco-button--primary"},
+                "Easy Apply",
+                on_click=lambda element: self.click_apply(window),
+            ))
+        children.append(self.element("div", {"id": "job-details"}, job["description"]))
+        return self.element("div", {"class": "jobs-search__job-details--wrapper"}, children=children)
+
+    def render_field(self, field):
+        kind = field.get("kind", "text")
+        label = self.element("label", text=field["label"])
+        if kind in ("text", "file"):
+            attributes = {"type": kind, "value": field.get("value", "")}
+            if field.get("typeahead"):
+                attributes["role"] = "combobox"
+            return self.element("div", {"data-test-form-element": ""}, children=[label, self.element("input", attributes)])
+        if kind == "textarea":
+            return self.element("div", {"data-test-form-element": ""}, children=[
+                label, self.element("textarea", {"value": field.get("value", "")}),
+            ])
+        if kind in ("select", "entity_list"):
+            options = (["Select an option"] if kind == "entity_list" else []) + field["options"]
+            select = self.element("select", children=[
+                self.element("option", {"value": option}, option) for option in options
+            ])
+            attribute = "data-test-text-entity-list-form-component" if kind == "entity_list" else "data-test-form-element"
+            return self.element("div", {attribute: ""}, children=[label, select])
+        attribute = (
+            "data-test-checkbox-form-component" if kind == "checkbox" else "data-test-form-builder-radio-button-form-component"
+        )
+        return self.element("fieldset", {attribute: ""}, children=[
+            self.element("legend", text=field["label"]),
+            *(
+                self.element("div", children=[
+                    self.element("input", {"type": kind, "name": field["label"]}),
+                    self.element("label", text=option),
+                ])
+                for option in field["options"]
+            ),
+        ])
+
+    def render_modal(self, window, job_id, step):
+        steps = self.get_steps(job_id)
+        kind = steps[step].get("button", "submit" if step == len(steps) - 1 else "next")
+        buttons = {
+            "next": ({"data-easy-apply-next-button": ""}, "Next"),
+            "review": ({"aria-label": "Review your application"}, "Review"),
+            "submit": ({"aria-label": "Submit application"}, "Submit application"),
+        }
+        children = [
+            self.element(
+                "button",
+                {
+                    "class": "artdeco-button artdeco-button--circle artdeco-button--muted artdeco-button--2 "
+                             "artdeco-button--tertiary artdeco-modal__dismiss",
+                    "aria-label": "Dismiss",
+                },
+                on_click=lambda element: self.click_dismiss(window),
+            ),
+            self.element("progress", {"value": str(round(100 * step / len(steps)))}),
+            self.element("form", children=[self.render_field(field) for field in steps[step].get("fields", [])]),
+        ]
+        if kind in buttons:
+            attributes, text = buttons[kind]
+            children.append(self.element(
+                "button",
+                {"class": "artdeco-button artdeco-button--primary", **attributes},
+                text,
+                on_click=lambda element: self.click_step_button(window, kind),
+            ))
+        return self.element(
+            "div",
+            {"class": "artdeco-modal artdeco-modal--layer-default jobs-easy-apply-modal", "role": "dialog"},
+            children=children,
+        )
+
+    def click_job_card(self, card):
+        window = self.current_window
+        job_id = card.attributes["data-occludable-job-id"]
+        if self.take_fault(job_id, "staleCard"):
+            window.set_component("list", self.render_job_list(window, window.pages[window.page - 1]))
+            raise StaleElementReferenceException(f"Job card {job_id} was re-rendered")
+        if self.take_fault(job_id, "interceptedClick"):
+            raise ElementClickInterceptedException(f"Click on job card {job_id} was intercepted by an overlay")
+        self.selected_jobs.append(job_id)
+        if self.take_fault(job_id, "detailsTimeout"):
+            window.set_component("details", None)
+            return
+        window.show_job(job_id)
+
+    def click_apply(self, window):
+        if self.take_fault(window.job_id, "modalTimeout"):
+            return
+        window.show_step(0)
+
+    def click_step_button(self, window, kind):
+        steps = self.get_steps(window.job_id)
+        if not self.step_is_valid(window.components["modal"], steps[window.step]):
+            return
+        if self.take_fault(window.job_id, "modalDisappears"):
+            window.set_component("modal", None)
+            return
+        if kind != "submit":
+            window.show_step(window.step + 1)
+            return
+        self.applied.add(window.job_id)
+        window.set_component("modal", None)
+        window.show_job(window.job_id)
+        window.set_component("dialog", self.element("div", {"class": "artdeco-modal", "role": "dialog"}, children=[
+            self.element("h2", text="Your application was sent"),
+            self.element(
+                "button",
+                {"class": "artdeco-button artdeco-button--primary"},
+                "Done",
+                on_click=lambda element: window.set_component("dialog", None),
+            ),
+        ]))
+
+    def click_dismiss(self, window):
+        window.set_component("dialog", self.element("div", {"class": "artdeco-modal", "role": "alertdialog"}, children=[
+            self.element("h2", text="Discard application?"),
+            self.element(
+                "button",
+                {"data-control-name": "discard_application_confirm_btn"},
+                "Discard",
+                on_click=lambda element: self.discard_application(window),
+            ),
+        ]))
+
+    def discard_application(self, window):
+        window.set_component("modal", None)
+        window.set_component("dialog", None)
+
+    def step_is_valid(self, modal, step):
+        for field, element in zip(step.get("fields", []), modal.select_one("form").children):
+            kind = field.get("kind", "text")
+            if not field.get("required", kind != "checkbox"):
+                continue
+            if kind in ("radio", "checkbox"):
+                answered = any(option.checked for option in element.select(f"input[type='{kind}']"))
+            else:
+                answered = element.select_one("input, select, textarea").value not in ("", "Select an option")
+            if not answered:
+                return False
+        return True
+
+    def script_click(self, element):
+        self.dispatch_click(element)
+
+    def script_job_details(self):
+        document = self.current_window.document
+        wrapper = document.select_one(".jobs-search__job-details--wrapper") or document
+
+        def text(selector):
+            element = wrapper.select_one(selector)
+            return element.inner_text.strip() if element else ""
+
+        return {
+            "title": text(".job-details-jobs-unified-top-card__job-title"),
+            "company": text(".job-details-jobs-unified-top-card__company-name"),
+            "primaryDescription": text(".job-details-jobs-unified-top-card__primary-description-container"),
+            "description": text("#job-details"),
+            "easyApply": wrapper.select_one("button.jobs-apply-button.artdeco-button--primary") is not None,
+        }
+
+    def script_job_cards(self, container):
+        cards = []
+        for card in container.select("li"):
+            title = card.select_one(".job-card-list__title, .job-card-container__link")
+            cards.append({
+                "id": card.attributes.get("data-occludable-job-id") or card.attributes.get("data-job-id"),
+                "title": title.inner_text.strip() if title else "",
+                "text": card.inner_text,
+            })
+        return cards
+
+    def script_easy_apply_step(self, modal):
+        buttons = {
+            "next": modal.select_one("button[data-easy-apply-next-button]"),
+            "review": modal.select_one("button[aria-label='Review your application']"),
+            "submit": modal.select_one("button[aria-label='Submit application']"),
+        }
+        kind = next((name for name in ("next", "review", "submit") if buttons[name]), "unknown")
+        progress_bar = modal.select_one("progress, [role='progressbar']")
+        progress = None
+        if progress_bar is not None:
+            try:
+                progress = float(
+                    progress_bar.attributes.get("value") or progress_bar.attributes.get("aria-valuenow")
+                )
+            except (TypeError, ValueError):
+                progress = None
+        fields = []
+        for element in modal.select(
+            "div[data-test-form-element], fieldset[data-test-form-builder-radio-button-form-component], "
+            "fieldset[data-test-checkbox-form-component], div[data-test-text-entity-list-form-component]"
+        ):
+            label = element.select_one("label, legend, span[aria-hidden='true']")
+            if label is None:
+                continue
+
+            def has(attribute):
+                return attribute in element.attributes or element.select_one(f"[{attribute}]") is not None
+
+            input_element = None
+            field_kind = None
+            if has("data-test-checkbox-form-component"):
+                field_kind = "checkbox"
+            elif has("data-test-text-entity-list-form-component"):
+                input_element = element.select_one("select")
+                field_kind = "entity_list" if input_element else None
+            else:
+                input_element = element.select_one("input, select, textarea")
+                tag = input_element.tag if input_element else None
+                if tag in ("select", "textarea"):
+                    field_kind = tag
+                elif tag == "input" and input_element.get_property("type") in ("text", "radio", "file"):
+                    field_kind = input_element.get_property("type")
+            if field_kind:
+                fields.append({
+                    "element": element,
+                    "input": input_element,
+                    "label": label.inner_text.strip(),
+                    "kind": field_kind,
+                    "value": input_element.value if input_element else None,
+                    "typeahead": input_element is not None and (
+                        input_element.attributes.get("role") == "combobox"
+                        or "aria-autocomplete" in input_element.attributes
+                    ),
+                })
+        return {"kind": kind, "progress": progress, "button": buttons.get(kind), "fields": fields}
+
+    def script_form_plan(self, batched):
+        def label_of(input_element):
+            label = next((sibling for sibling in input_element.following_siblings() if sibling.tag == "label"), None)
+            return label.inner_text.strip() if label else ""
+
+        filled = 0
+        for element, input_element, kind, answer in batched:
+            if kind in ("text", "textarea"):
+                if input_element.value == "":
+                    input_element.value = answer
+            elif kind in ("select", "entity_list"):
+                option = next(
+                    (
+                        option
+                        for option in input_element.select("option")
+                        if (option.get_property("value") if kind == "select" else option.inner_text.strip()) == answer
+                    ),
+                    None,
+                )
+                if option is not None:
+                    input_element.value = option.get_property("value")
+            elif kind == "radio":
+                radio = next(
+                    (
+                        radio
+                        for radio in element.select("input[type='radio']")
+                        if label_of(radio).lower() == str(answer).lower()
+                    ),
+                    None,
+                )
+                if radio is not None:
+                    self.dispatch_click(radio)
+            elif kind == "checkbox":
+                for checkbox in element.select("input[type='checkbox']"):
+                    label = label_of(checkbox)
+                    if label in answer and checkbox.checked != answer[label]:
+                        self.dispatch_click(checkbox)
+            filled += 1
+        return filled
@@ -0,0 +1,136 @@
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+
+class JobCatalog:
+    BATCH_SIZE = 25
+    SKIP_OUTCOMES = ("applied", "no_easy_apply", "already_applied_company", "excluded", "failed_permanent")
+    COLUMNS = (
+        "job_id",
+        "title",
+        "company",
+        "location",
+        "posted",
+        "easy_apply",
+        "description_hash",
+        "outcome",
+        "first_seen",
+        "last_seen",
+    )
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.pending = {}
+        self.create_schema()
+
+    def create_schema(self):
+        with self.connection:
+            self.connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    company TEXT,
+                    location TEXT,
+                    posted TEXT,
+                    easy_apply INTEGER,
+                    description_hash TEXT,
+                    outcome TEXT,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL
+                )
+                """
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_jobs_outcome ON jobs (outcome, last_seen)")
+
+    def get_job(self, job_id):
+        if job_id in self.pending:
+            return self.pending[job_id]
+        row = self.connection.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def is_unchanged(self, job_id, description_hash):
+        if not job_id or not description_hash:
+            return False
+        job = self.get_job(job_id)
+        return (
+            job is not None
+            and job["description_hash"] == description_hash
+            and job["outcome"] in self.SKIP_OUTCOMES
+        )
+
+    def record_job(self, job_id, outcome, title=None, company=None, location=None, posted=None,
+                   easy_apply=None, description_hash=None):
+        if not job_id:
+            return
+        now = str(datetime.now())
+        previous = self.get_job(job_id) or {}
+        self.pending[job_id] = {
+            "job_id": job_id,
+            "title": title or previous.get("title"),
+            "company": company or previous.get("company"),
+            "location": location or previous.get("location"),
+            "posted": posted or previous.get("posted"),
+            "easy_apply": int(easy_apply) if easy_apply is not None else previous.get("easy_apply"),
+            "description_hash": description_hash or previous.get("description_hash"),
+            "outcome": outcome,
+            "first_seen": previous.get("first_seen", now),
+            "last_seen": now,
+        }
+        if len(self.pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in self.COLUMNS[1:] if column != "first_seen")
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO jobs ({', '.join(self.COLUMNS)}) VALUES ({placeholders}) "
+                f"ON CONFLICT (job_id) DO UPDATE SET {updates}",
+                [tuple(job[column] for column in self.COLUMNS) for job in self.pending.values()],
+            )
+        self.pending = {}
+
+    def report(self, days=7):
+        self.flush()
+        since = str(datetime.now() - timedelta(days=days))
+        total = self.connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        outcomes = self.connection.execute(
+            "SELECT outcome, COUNT(*) AS count FROM jobs GROUP BY outcome ORDER BY count DESC"
+        ).fetchall()
+        recent = self.connection.execute(
+            "SELECT COUNT(*) FROM jobs WHERE last_seen >= ?", (since,)
+        ).fetchone()[0]
+        companies = self.connection.execute(
+            "SELECT company, COUNT(*) AS count FROM jobs WHERE outcome = 'applied' "
+            "GROUP BY company ORDER BY count DESC LIMIT 10"
+        ).fetchall()
+        return {
+            "total_jobs": total,
+            "seen_last_days": {"days": days, "count": recent},
+            "outcomes": {row["outcome"]: row["count"] for row in outcomes},
+            "top_applied_companies": {row["company"]: row["count"] for row in companies},
+        }
+
+    def close(self):
+        self.flush()
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    catalog = JobCatalog(sys.argv[1] if len(sys.argv) > 1 else "job_catalog.db")
+    report = catalog.report()
+    catalog.close()
+    print(f"Jobs in catalog: {report['total_jobs']}")
+    print(f"Seen in the last {report['seen_last_days']['days']} days: {report['seen_last_days']['count']}")
+    print("Outcomes:")
+    for outcome, count in report["outcomes"].items():
+        print(f"  {outcome}: {count}")
+    print("Top companies applied to:")
+    for company, count in report["top_applied_companies"].items():
+        print(f"  {company}: {count}")
@@ -1,7 +1,12 @@
+import hashlib
+import argparse
 import json
+import re
+import statistics
 import time
 import urllib.parse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from selenium import webdriver
@@ -15,11 +20,33 @@ from selenium.common.exceptions import (
     StaleElementReferenceException,
     TimeoutException,
     ElementClickInterceptedException,
+    WebDriverException,
 )
 from selenium.webdriver.firefox.service import Service as FirefoxService
+from job_catalog import JobCatalog
+from metrics import BotMetrics, MetricsServer
+from webdriver_tracer import WebDriverTracer
+
+class MeteredWebDriverWait(WebDriverWait):
+    def __init__(self, driver, timeout, timeouts_counter):
+        super().__init__(driver, timeout)
+        self.timeouts_counter = timeouts_counter
+
+    def until(self, method, message=""):
+        try:
+            return super().until(method, message)
+        except TimeoutException:
+            self.timeouts_counter.inc()
+            raise
+
+class EasyApplyError(Exception):
+    def __init__(self, cause, message):
+        super().__init__(message)
+        self.cause = cause
 
 class EasyApplyLinkedin:
     BASE_URL = "https://www.linkedin.com/jobs/search/"
+    JOB_VIEW_URL = "https://www.linkedin.com/jobs/view/{}/"
     COLLECTION_URLS = {
         "small_business": "https://www.linkedin.com/jobs/collections/small-business",
         "remote_jobs": "https://www.linkedin.com/jobs/collections/remote-jobs",
@@ -29,6 +56,28 @@ class EasyApplyLinkedin:
     ERROR_LOG_PATH = Path("error_log.json")
     APPLIED_COMPANIES_LOG_PATH = Path("applied_companies_log.json")
     FAILED_APPLICATIONS_LOG_PATH = Path("failed_applications_log.json")
+    SEEN_JOBS_CACHE_PATH = Path("seen_jobs_cache.json")
+    JOB_CATALOG_PATH = Path("job_catalog.db")
+    RUN_HISTORY_PATH = Path("run_history.json")
+    GEO_ID_CACHE_PATH = Path("geo_id_cache.json")
+    GEO_ID_RETRY_HOURS = 24
+    LAST_SUCCESSFUL_PASSES_PATH = Path("last_successful_passes.json")
+    DAEMON_INTERVAL_MINUTES = 60
+    RETRY_QUEUE_PATH = Path("retry_queue.json")
+    RETRY_BASE_DELAY_MINUTES = 30
+    RETRY_MAX_ATTEMPTS = 3
+    FAILURE_TRANSIENT = "transient"
+    FAILURE_UNKNOWN_QUESTION = "unknown_question"
+    FAILURE_PERMANENT = "permanent"
+    TIME_POSTED_MARGIN_SECONDS = 300
+    SEARCH_PLAN_PATH = Path("search_plan.json")
+    DEFAULT_LOCATION_SECONDS = 900
+    FORM_PLAN_CACHE_PATH = Path("form_plan_cache.json")
+    FORM_PLAN_TTL_DAYS = 30
+    FORM_PLAN_MAX_ENTRIES = 500
+    SEEN_JOBS_TTL_HOURS = 24
+    SEEN_JOBS_MAX_ENTRIES = 5000
+    APPLICANTS_PATTERN = re.compile(r"(\d[\d,]*)\s+applicants?")
 
     TIME_POSTED_MAPPING = {
         "Any Time": "",
@@ -76,6 +125,149 @@ class EasyApplyLinkedin:
         "Volunteer": "5",
     }
 
+    JOB_DETAILS_SCRIPT = """
+        const wrapper = document.querySelector(".jobs-search__job-details--wrapper") || document;
+        const text = (selector) => {
+            const element = wrapper.querySelector(selector);
+            return element ? element.innerText.trim() : "";
+        };
+        return {
+            title: text(".job-details-jobs-unified-top-card__job-title"),
+            company: text(".job-details-jobs-unified-top-card__company-name"),
+            primaryDescription: text(".job-details-jobs-unified-top-card__primary-description-container"),
+            description: text("#job-details"),
+            easyApply: !!wrapper.querySelector("button.jobs-apply-button.artdeco-button--primary"),
+        };
+    """
+
+    EASY_APPLY_MAX_STEPS = 15
+    EASY_APPLY_STEP_SUBMIT = "submit"
+    EASY_APPLY_STEP_UNKNOWN = "unknown"
+    EASY_APPLY_STEP_SCRIPT = """
+        const modal = arguments[0];
+        const buttons = {
+            next: modal.querySelector("button[data-easy-apply-next-button]"),
+            review: modal.querySelector("button[aria-label='Review your application']"),
+            submit: modal.querySelector("button[aria-label='Submit application']"),
+        };
+        const kind = ["next", "review", "submit"].find((name) => buttons[name]) || "unknown";
+        const progressBar = modal.querySelector("progress, [role='progressbar']");
+        const progress = progressBar
+            ? parseFloat(progressBar.getAttribute("value") || progressBar.getAttribute("aria-valuenow"))
+            : null;
+        const fields = [];
+        const formElements = modal.querySelectorAll(
+            "div[data-test-form-element], fieldset[data-test-form-builder-radio-button-form-component], "
+            + "fieldset[data-test-checkbox-form-component], div[data-test-text-entity-list-form-component]"
+        );
+        for (const element of formElements) {
+            const label = element.querySelector("label, legend, span[aria-hidden='true']");
+            if (!label) {
+                continue;
+            }
+            const has = (attribute) => element.hasAttribute(attribute) || element.querySelector(`[${attribute}]`);
+            let input = null;
+            let fieldKind = null;
+            if (has("data-test-checkbox-form-component")) {
+                fieldKind = "checkbox";
+            } else if (has("data-test-text-entity-list-form-component")) {
+                input = element.querySelector("select");
+                fieldKind = input ? "entity_list" : null;
+            } else {
+                input = element.querySelector("input, select, textarea");
+                const tag = input ? input.tagName.toLowerCase() : null;
+                if (tag === "select" || tag === "textarea") {
+                    fieldKind = tag;
+                } else if (tag === "input" && ["text", "radio", "file"].includes(input.type)) {
+                    fieldKind = input.type;
+                }
+            }
+            if (fieldKind) {
+                fields.push({
+                    element: element,
+                    input: input,
+                    label: label.innerText.trim(),
+                    kind: fieldKind,
+                    value: input ? input.value : null,
+                    typeahead: !!input && (input.getAttribute("role") === "combobox" || input.hasAttribute("aria-autocomplete")),
+                });
+            }
+        }
+        return {
+            kind: kind,
+            progress: Number.isNaN(progress) ? null : progress,
+            button: buttons[kind] || null,
+            fields: fields,
+        };
+    """
+
+    FORM_PLAN_SCRIPT = """
+        const setValue = (input, value) => {
+            const setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(input), "value").set;
+            setter.call(input, value);
+            input.dispatchEvent(new Event("input", { bubbles: true }));
+            input.dispatchEvent(new Event("change", { bubbles: true }));
+        };
+        const labelOf = (input) => {
+            let sibling = input.nextElementSibling;
+            while (sibling && sibling.tagName !== "LABEL") {
+                sibling = sibling.nextElementSibling;
+            }
+            return sibling ? sibling.innerText.trim() : "";
+        };
+        let filled = 0;
+        for (const [element, input, kind, answer] of arguments[0]) {
+            if (kind === "text" || kind === "textarea") {
+                if (input.value === "") {
+                    setValue(input, answer);
+                }
+            } else if (kind === "select" || kind === "entity_list") {
+                const option = Array.from(input.options).find(
+                    (option) => (kind === "select" ? option.value : option.text.trim()) === answer
+                );
+                if (option) {
+                    setValue(input, option.value);
+                }
+            } else if (kind === "radio") {
+                const radio = Array.from(element.querySelectorAll("input[type='radio']")).find(
+                    (radio) => labelOf(radio).toLowerCase() === String(answer).toLowerCase()
+                );
+                if (radio) {
+                    radio.click();
+                }
+            } else if (kind === "checkbox") {
+                for (const checkbox of element.querySelectorAll("input[type='checkbox']")) {
+                    const label = labelOf(checkbox);
+                    if (label in answer && checkbox.checked !== answer[label]) {
+                        checkbox.click();
+                    }
+                }
+            }
+            filled += 1;
+        }
+        return filled;
+    """
+
+    RENDER_JOB_CARDS_SCRIPT = """
+        const cards = arguments[0].querySelectorAll("li");
+        cards.forEach((card) => card.scrollIntoView({block: "nearest"}));
+        if (cards.length) {
+            cards[0].scrollIntoView({block: "nearest"});
+        }
+        return cards.length;
+    """
+
+    JOB_CARDS_SCRIPT = """
+        return Array.from(arguments[0].querySelectorAll("li")).map((card) => {
+            const title = card.querySelector(".job-card-list__title, .job-card-container__link");
+            return {
+                id: card.getAttribute("data-occludable-job-id") || card.getAttribute("data-job-id"),
+                title: title ? title.innerText.trim() : "",
+                text: card.innerText || "",
+            };
+        });
+    """
+
     LOCATION_MAPPING = {
         "Texas": "102748797",
         "Canada": "101174742",
@@ -93,7 +285,21 @@ class EasyApplyLinkedin:
         "United Kingdom": "101165590",
     }
 
-    def __init__(self, data):
+    def __init__(self, data, driver_factory=None, prelaunch=False, plan_only=False):
+        started = time.perf_counter()
+        self.driver_path = data["driver_path"]
+        self.driver_factory = driver_factory or self.create_firefox_driver
+        self._driver = None
+        self._driver_future = None
+        self.startup_timings = {}
+        self.plan_only = plan_only
+        self.metrics = BotMetrics()
+        self.metrics_server = None
+        self.metrics_port = data.get("metricsPort")
+        self.tracer = WebDriverTracer() if data.get("traceWebDriver") else None
+        self.trace_folded_path = data.get("traceFoldedPath")
+        if prelaunch:
+            self.start_driver()
         self.email = data["email"]
         self.password = data["password"]
         self.keywords = " OR ".join(data["keywords"])
@@ -104,17 +310,168 @@ class EasyApplyLinkedin:
         self.sort_by = data["sortBy"]
         self.context_data = data
         self.current_location_index = 0
+        self.seen_jobs_ttl = timedelta(hours=data.get("seenJobsTtlHours", self.SEEN_JOBS_TTL_HOURS))
+        self.seen_jobs_max_entries = data.get("seenJobsMaxEntries", self.SEEN_JOBS_MAX_ENTRIES)
+        self.keywords_to_avoid_pattern = (
+            re.compile(
+                r"(?<!\w)(?:" + "|".join(re.escape(keyword) for keyword in data["keywordsToAvoid"]) + r")(?!\w)",
+                re.IGNORECASE,
+            )
+            if data["keywordsToAvoid"]
+            else None
+        )
+        self.daemon_interval = timedelta(minutes=data.get("daemonIntervalMinutes", self.DAEMON_INTERVAL_MINUTES))
+        self.incremental = False
+        self.retry_max_attempts = data.get("retryMaxAttempts", self.RETRY_MAX_ATTEMPTS)
+        self.pass_started_at = None
+        self.ranking = self.build_ranking(data["keywords"], data.get("ranking"))
+        self.application_budget = data.get("applicationBudget")
+        self.applications_submitted = 0
+        self.job_scores = []
+        self.prefetch_enabled = data.get("prefetchNextJob", False)
+        self.main_window = None
+        self.prefetch_window = None
+        self.prefetch_job_id = None
+        self.prefetched_jobs = {}
+        self.job_applicants = {}
         if "user_inputs" not in self.context_data:
             self.context_data["user_inputs"] = {}
-        firefox_service = FirefoxService(executable_path=data["driver_path"])
-        self.driver = webdriver.Firefox(service=firefox_service)
         self.init_logging()
+        if self.metrics_port is not None and not self.plan_only:
+            self.start_metrics_server()
+        self.startup_timings["init"] = time.perf_counter() - started
+        self.log_info(
+            f"Initialized in {self.startup_timings['init'] * 1000:.1f} ms "
+            f"({'browser launching in background' if prelaunch else 'browser deferred until first use'})."
+        )
+
+    def create_firefox_driver(self):
+        firefox_service = FirefoxService(executable_path=self.driver_path)
+        return webdriver.Firefox(service=firefox_service)
+
+    def launch_driver(self):
+        started = time.perf_counter()
+        driver = self.instrument_driver(self.driver_factory())
+        self.startup_timings["browser"] = time.perf_counter() - started
+        return driver
+
+    def instrument_driver(self, driver):
+        if self.metrics_port is not None:
+            execute = driver.execute
+            observe = self.metrics.webdriver_command_seconds.observe
+
+            def timed_execute(driver_command, params=None):
+                started = time.perf_counter()
+                try:
+                    return execute(driver_command, params)
+                finally:
+                    observe(time.perf_counter() - started, driver_command)
+
+            driver.execute = timed_execute
+        if self.tracer is not None:
+            driver = self.tracer.attach(driver)
+        return driver
+
+    def log_trace_report(self):
+        if self.tracer is None:
+            return
+        self.log_info(self.tracer.report())
+        if self.trace_folded_path:
+            self.tracer.write_folded(self.trace_folded_path)
+            self.log_info(f"Folded WebDriver stacks written to {self.trace_folded_path}")
+
+    def start_metrics_server(self):
+        try:
+            self.metrics_server = MetricsServer(self.metrics, self.metrics_port).start()
+            self.log_info(f"Serving metrics on http://127.0.0.1:{self.metrics_server.port}/metrics")
+        except OSError as e:
+            self.log_error(f"Could not start metrics server on port {self.metrics_port}: {e}")
+
+    def wait(self, timeout):
+        return MeteredWebDriverWait(self.driver, timeout, self.metrics.wait_timeouts)
+
+    def start_driver(self):
+        if self._driver is None and self._driver_future is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._driver_future = executor.submit(self.launch_driver)
+            executor.shutdown(wait=False)
+
+    def reset_driver(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                self.log_info(f"Could not quit the previous browser session: {e}")
+        self._driver = None
+        self._driver_future = None
+        self.main_window = None
+        self.prefetch_window = None
+        self.prefetch_job_id = None
+
+    @property
+    def driver_started(self):
+        return self._driver is not None or self._driver_future is not None
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            started = time.perf_counter()
+            if self._driver_future is None:
+                self._driver = self.launch_driver()
+            else:
+                self._driver = self._driver_future.result()
+                self._driver_future = None
+            self.startup_timings["browser_wait"] = time.perf_counter() - started
+            self.log_info(
+                f"Browser ready after {self.startup_timings['browser_wait']:.2f} s wait "
+                f"(launch took {self.startup_timings['browser']:.2f} s)."
+            )
+        return self._driver
+
+    @driver.setter
+    def driver(self, driver):
+        self._driver = self.instrument_driver(driver)
+        self._driver_future = None
+
+    def build_ranking(self, keywords, ranking):
+        if ranking is None:
+            return None
+        keyword_weights = {
+            keyword.lower(): weight
+            for keyword, weight in ranking.get("keywordWeights", {keyword: 1 for keyword in keywords}).items()
+        }
+        workplace_weights = {
+            workplace.lower(): weight for workplace, weight in ranking.get("workplaceWeights", {}).items()
+        }
+        return {
+            "keyword_weights": keyword_weights,
+            "keyword_pattern": self.compile_word_pattern(keyword_weights),
+            "title_match_weight": ranking.get("titleMatchWeight", 2),
+            "workplace_weights": workplace_weights,
+            "workplace_pattern": self.compile_word_pattern(workplace_weights),
+            "applicant_weight": ranking.get("applicantWeight", -0.02),
+            "applicant_pattern": self.APPLICANTS_PATTERN,
+        }
+
+    def compile_word_pattern(self, words):
+        if not words:
+            return re.compile(r"(?!)")
+        alternatives = "|".join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+        return re.compile(r"(?<!\w)(" + alternatives + r")(?!\w)")
 
     def init_logging(self):
         logging.basicConfig(level=logging.INFO)
         self.error_logger = logging.getLogger("ErrorLogger")
         self.applied_companies = self.load_json(self.APPLIED_COMPANIES_LOG_PATH)
         self.failed_applications = self.load_json(self.FAILED_APPLICATIONS_LOG_PATH)
+        self.run_history = self.load_json(self.RUN_HISTORY_PATH)
+        self.last_successful_passes = self.load_json(self.LAST_SUCCESSFUL_PASSES_PATH)
+        self.retry_queue = self.load_json(self.RETRY_QUEUE_PATH)
+        self.geo_id_cache = self.load_json(self.GEO_ID_CACHE_PATH)
+        self.seen_jobs = self.load_json(self.SEEN_JOBS_CACHE_PATH)
+        self.form_plans = self.load_json(self.FORM_PLAN_CACHE_PATH)
+        self.form_plan_stats = {"hits": 0, "misses": 0}
+        self.job_catalog = None if self.plan_only else JobCatalog(self.JOB_CATALOG_PATH)
 
     def load_json(self, path):
         if path.exists():
@@ -160,20 +517,120 @@ class EasyApplyLinkedin:
         }
         self.save_json(self.APPLIED_COMPANIES_LOG_PATH, self.applied_companies)
 
-    def log_failed_application(self, company):
-        self.failed_applications[company] = str(datetime.now())
+    def log_run_timing(self, search, seconds, jobs_processed):
+        self.run_history[str(datetime.now())] = {
+            "search": search,
+            "seconds": round(seconds, 1),
+            "jobs": jobs_processed,
+        }
+        self.cleanup_run_history()
+
+    def cleanup_run_history(self):
+        cutoff = datetime.now() - timedelta(weeks=4)
+        self.run_history = {
+            k: v
+            for k, v in self.run_history.items()
+            if datetime.fromisoformat(k) > cutoff
+        }
+        self.save_json(self.RUN_HISTORY_PATH, self.run_history)
+
+    def log_successful_pass(self):
+        if self.pass_started_at is None:
+            return
+        self.last_successful_passes[self.get_query_key()] = str(self.pass_started_at)
+        self.save_json(self.LAST_SUCCESSFUL_PASSES_PATH, self.last_successful_passes)
+
+    def get_seconds_since_last_pass(self):
+        query_key = self.get_query_key()
+        if not self.incremental or query_key not in self.last_successful_passes:
+            return None
+        last_pass = datetime.fromisoformat(self.last_successful_passes[query_key])
+        return int((datetime.now() - last_pass).total_seconds()) + self.TIME_POSTED_MARGIN_SECONDS
+
+    def log_failed_application(self, company, cause=None, job_id=None, error=None):
+        self.failed_applications[company] = {"timestamp": str(datetime.now()), "cause": cause, "job_id": job_id}
         self.save_json(self.FAILED_APPLICATIONS_LOG_PATH, self.failed_applications)
         self.cleanup_failed_applications_log()
+        if cause == self.FAILURE_TRANSIENT and job_id:
+            self.enqueue_retry(job_id, company, error)
+        elif job_id in self.retry_queue:
+            self.log_info(f"Not retrying job {job_id} at {company} after a {cause} failure.")
+            del self.retry_queue[job_id]
+            self.save_json(self.RETRY_QUEUE_PATH, self.retry_queue)
+
+    def enqueue_retry(self, job_id, company, error=None):
+        previous = self.retry_queue.get(job_id, {})
+        attempts = previous.get("attempts", 0) + 1
+        if attempts > self.retry_max_attempts:
+            self.log_info(f"Giving up on job {job_id} at {company} after {attempts - 1} attempts.")
+            self.retry_queue.pop(job_id, None)
+        else:
+            delay = timedelta(minutes=self.RETRY_BASE_DELAY_MINUTES * 2 ** (attempts - 1))
+            self.retry_queue[job_id] = {
+                "company": company,
+                "search": previous.get("search") or self.collection or self.locations[self.current_location_index],
+                "error": error,
+                "attempts": attempts,
+                "next_attempt": str(datetime.now() + delay),
+            }
+        self.save_json(self.RETRY_QUEUE_PATH, self.retry_queue)
+
+    def get_due_retries(self):
+        now = datetime.now()
+        return [
+            job_id
+            for job_id, entry in self.retry_queue.items()
+            if datetime.fromisoformat(entry["next_attempt"]) <= now
+        ]
 
     def cleanup_failed_applications_log(self):
         cutoff = datetime.now() - timedelta(weeks=2)
         self.failed_applications = {
             k: v
             for k, v in self.failed_applications.items()
-            if datetime.fromisoformat(v) > cutoff
+            if datetime.fromisoformat(v["timestamp"] if isinstance(v, dict) else v) > cutoff
         }
         self.save_json(self.FAILED_APPLICATIONS_LOG_PATH, self.failed_applications)
 
+    def get_query_key(self):
+        if self.collection:
+            return f"collection:{self.collection}"
+        query = json.dumps(
+            [self.keywords, self.keywords_to_avoid, self.filters, self.sort_by], sort_keys=True
+        )
+        digest = hashlib.sha1(query.encode("utf-8")).hexdigest()[:12]
+        return f"{self.locations[self.current_location_index]}:{digest}"
+
+    def is_recently_seen(self, job_id):
+        if not job_id:
+            return False
+        entry = self.seen_jobs.get(self.get_query_key(), {}).get(job_id)
+        if entry is None:
+            return False
+        return datetime.fromisoformat(entry["timestamp"]) > datetime.now() - self.seen_jobs_ttl
+
+    def record_seen_job(self, job_id, outcome):
+        if not job_id:
+            return
+        query_jobs = self.seen_jobs.setdefault(self.get_query_key(), {})
+        query_jobs[job_id] = {"outcome": outcome, "timestamp": str(datetime.now())}
+        self.cleanup_seen_jobs_cache()
+
+    def cleanup_seen_jobs_cache(self):
+        cutoff = datetime.now() - self.seen_jobs_ttl
+        entries = [
+            (entry["timestamp"], query_key, job_id)
+            for query_key, query_jobs in self.seen_jobs.items()
+            for job_id, entry in query_jobs.items()
+            if datetime.fromisoformat(entry["timestamp"]) > cutoff
+        ]
+        entries.sort(reverse=True)
+        seen_jobs = {}
+        for _, query_key, job_id in entries[:self.seen_jobs_max_entries]:
+            seen_jobs.setdefault(query_key, {})[job_id] = self.seen_jobs[query_key][job_id]
+        self.seen_jobs = seen_jobs
+        self.save_json(self.SEEN_JOBS_CACHE_PATH, self.seen_jobs)
+
     def login_linkedin(self):
         try:
             self.driver.get("https://www.linkedin.com/login")
@@ -187,20 +644,20 @@ class EasyApplyLinkedin:
                 'httpOnly': False
             })
             self.driver.refresh()
-            WebDriverWait(self.driver, 10).until(
+            self.wait(10).until(
                 EC.presence_of_element_located((By.NAME, "session_key"))
             )
             login_email = self.driver.find_element(By.NAME, "session_key")
             login_email.clear()
             login_email.send_keys(self.email)
-            WebDriverWait(self.driver, 10).until(
+            self.wait(10).until(
                 EC.presence_of_element_located((By.NAME, "session_password"))
             )
             login_pass = self.driver.find_element(By.NAME, "session_password")
             login_pass.clear()
             login_pass.send_keys(self.password)
             login_pass.send_keys(Keys.RETURN)
-            WebDriverWait(self.driver, 30).until(
+            self.wait(30).until(
                 EC.presence_of_element_located((By.LINK_TEXT, "Jobs"))
             )
         except Exception as e:
@@ -209,35 +666,7 @@ class EasyApplyLinkedin:
     def job_search(self):
         while self.current_location_index < len(self.locations):
             try:
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.LINK_TEXT, "Jobs"))
-                )
-                jobs_link = self.driver.find_element(By.LINK_TEXT, "Jobs")
-                jobs_link.click()
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "input[aria-label='Search by title, skill, or company']")
-                    )
-                )
-                search_keywords = self.driver.find_element(
-                    By.CSS_SELECTOR, "input[aria-label='Search by title, skill, or company']")
-                search_keywords.clear()
-                search_keywords.send_keys(self.keywords)
-                search_keywords.send_keys(" NOT ")
-                search_keywords.send_keys(self.keywords_to_avoid)
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located(
-                        (By.CSS_SELECTOR, "input[aria-label='City, state, or zip code']")
-                    )
-                )
-                search_location = self.driver.find_element(
-                    By.CSS_SELECTOR, "input[aria-label='City, state, or zip code']")
-                search_location.clear()
-                search_location.send_keys(self.locations[self.current_location_index])
-                search_keywords.click()
-                search_keywords.send_keys(Keys.RETURN)
-
-                time.sleep(5)
+                self.search_via_ui(self.locations[self.current_location_index])
                 if not self.check_no_results():
                     break
                 else:
@@ -251,6 +680,80 @@ class EasyApplyLinkedin:
                 self.log_error(f"Job search error: {e}")
                 self.current_location_index += 1
 
+    def search_via_ui(self, location):
+        self.wait(20).until(
+            EC.presence_of_element_located((By.LINK_TEXT, "Jobs"))
+        )
+        jobs_link = self.driver.find_element(By.LINK_TEXT, "Jobs")
+        jobs_link.click()
+        self.wait(20).until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "input[aria-label='Search by title, skill, or company']")
+            )
+        )
+        search_keywords = self.driver.find_element(
+            By.CSS_SELECTOR, "input[aria-label='Search by title, skill, or company']")
+        search_keywords.clear()
+        search_keywords.send_keys(self.keywords)
+        search_keywords.send_keys(" NOT ")
+        search_keywords.send_keys(self.keywords_to_avoid)
+        self.wait(20).until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "input[aria-label='City, state, or zip code']")
+            )
+        )
+        search_location = self.driver.find_element(
+            By.CSS_SELECTOR, "input[aria-label='City, state, or zip code']")
+        search_location.clear()
+        search_location.send_keys(location)
+        search_keywords.click()
+        search_keywords.send_keys(Keys.RETURN)
+
+        try:
+            self.wait(10).until(EC.url_contains("geoId="))
+        except TimeoutException:
+            self.log_info(f"LinkedIn did not add a geoId to the search URL for {location}.")
+        self.learn_geo_id(location)
+
+    def learn_geo_id(self, location):
+        query = urllib.parse.urlparse(self.driver.current_url).query
+        geo_id = urllib.parse.parse_qs(query).get("geoId", [None])[0]
+        if location in self.LOCATION_MAPPING:
+            return geo_id
+        if geo_id:
+            self.geo_id_cache[location] = geo_id
+            self.log_info(f"Learned geoId {geo_id} for {location}.")
+        else:
+            self.geo_id_cache[location] = {"geoId": None, "checked": str(datetime.now())}
+        self.save_json(self.GEO_ID_CACHE_PATH, self.geo_id_cache)
+        return geo_id
+
+    def resolve_geo_id(self, location):
+        if location in self.LOCATION_MAPPING:
+            return self.LOCATION_MAPPING[location]
+        geo_id = self.geo_id_cache.get(location)
+        return geo_id["geoId"] if isinstance(geo_id, dict) else geo_id
+
+    def is_geo_id_lookup_due(self, location):
+        if self.resolve_geo_id(location):
+            return False
+        entry = self.geo_id_cache.get(location)
+        if not isinstance(entry, dict):
+            return True
+        retry_after = datetime.fromisoformat(entry["checked"]) + timedelta(hours=self.GEO_ID_RETRY_HOURS)
+        return datetime.now() >= retry_after
+
+    def ensure_geo_id(self, location):
+        if not self.is_geo_id_lookup_due(location):
+            return self.resolve_geo_id(location)
+        try:
+            self.search_via_ui(location)
+        except (TimeoutException, WebDriverException) as e:
+            self.log_info(f"Could not look up the geoId for {location}: {e}")
+            self.geo_id_cache[location] = {"geoId": None, "checked": str(datetime.now())}
+            self.save_json(self.GEO_ID_CACHE_PATH, self.geo_id_cache)
+        return self.resolve_geo_id(location)
+
     def construct_url(self):
         current_location = self.locations[self.current_location_index]
         combined_keywords = f'{self.keywords} NOT {self.keywords_to_avoid}'
@@ -288,21 +791,30 @@ class EasyApplyLinkedin:
         if self.filters.get("less_than_10_applicants"):
             params["f_EA"] = "true"
 
-        if current_location in self.LOCATION_MAPPING:
-            params["geoId"] = self.LOCATION_MAPPING[current_location]
+        geo_id = self.resolve_geo_id(current_location)
+        if geo_id:
+            params["geoId"] = geo_id
+
+        seconds_since_last_pass = self.get_seconds_since_last_pass()
+        if seconds_since_last_pass is not None:
+            configured_range = params.get("f_TPR", "")
+            if not re.fullmatch(r"r\d+", configured_range) or seconds_since_last_pass < int(configured_range[1:]):
+                params["f_TPR"] = f"r{seconds_since_last_pass}"
 
-        query_string = urllib.parse.urlencode(params, safe=",")
+        query_string = urllib.parse.urlencode(params, safe=",", quote_via=urllib.parse.quote)
         url = f"{self.BASE_URL}?{query_string}"
         return url
 
     def apply_filters_and_search(self):
         while self.current_location_index < len(self.locations):
+            self.ensure_geo_id(self.locations[self.current_location_index])
             search_url = self.construct_url()
             self.driver.get(search_url)
             time.sleep(5)
 
             if self.check_no_results():
                 self.log_info(f"No matching jobs found in {self.locations[self.current_location_index]}.")
+                self.log_successful_pass()
                 self.current_location_index += 1
             else:
                 break
@@ -379,107 +891,26 @@ class EasyApplyLinkedin:
             json.dump(self.context_data, config_file, indent=4)
 
     def find_offers(self):
+        self.pass_started_at = datetime.now()
+        self.applications_submitted = 0
+        self.drain_retry_queue()
         if self.collection:
             self.apply_collection()
         else:
             self.apply_filtered_jobs()
 
     def apply_filtered_jobs(self):
-        while self.current_location_index < len(self.locations):
+        while self.current_location_index < len(self.locations) and not self.budget_exhausted():
+            started = time.monotonic()
             self.apply_filters_and_search()
-
-            current_page = 1
-
-            while True:
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "scaffold-layout__list-container"))
-                    )
-
-                    job_list_container = self.find_element_with_retry(By.CLASS_NAME, "scaffold-layout__list-container")
-                    job_list_items = job_list_container.find_elements(By.TAG_NAME, "li")
-
-                    for index in range(len(job_list_items)):
-                        try:
-                            job_list_container = self.find_element_with_retry(By.CLASS_NAME, "scaffold-layout__list-container")
-                            job_list_items = job_list_container.find_elements(By.TAG_NAME, "li")
-
-                            if index >= len(job_list_items):
-                                break
-
-                            job_item = job_list_items[index]
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", job_item)
-                            time.sleep(1)
-
-                            try:
-                                self.driver.execute_script("arguments[0].click();", job_item)
-                            except ElementClickInterceptedException:
-                                self.log_info("Element click intercepted, skipping to next job...")
-                                continue
-
-                            time.sleep(2)
-
-                            WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located(
-                                    (By.CLASS_NAME, "jobs-search__job-details--wrapper")
-                                )
-                            )
-
-                            company_name = self.get_company_name(job_item)
-
-                            if company_name in self.applied_companies:
-                                self.log_info(f"Already applied to a job at {company_name}, skipping...")
-                                self.close_application_modal()
-                                continue
-
-                            job_details_wrapper = self.find_element_with_retry(By.CLASS_NAME, "jobs-search__job-details--wrapper")
-
-                            try:
-                                apply_button = job_details_wrapper.find_element(
-                                    By.CSS_SELECTOR, "button.jobs-apply-button.artdeco-button--primary"
-                                )
-                                apply_button.click()
-                                time.sleep(2)
-
-                                WebDriverWait(self.driver, 10).until(
-                                    EC.presence_of_element_located(
-                                        (By.CSS_SELECTOR, "div.jobs-easy-apply-modal")
-                                    )
-                                )
-
-                                try:
-                                    self.handle_easy_apply()
-                                    self.log_applied_company(company_name)
-                                except Exception as e:
-                                    self.log_info(f"Failed to apply at {company_name}: {str(e)}")
-                                    self.log_failed_application(company_name)
-
-                            except NoSuchElementException:
-                                self.log_info("No apply button found, continuing to next job...")
-                                continue
-
-                        except (NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException) as e:
-                            self.log_info(f"Exception occurred: {e}, continuing to next job...")
-                            self.log_error(f"Find offers error: {e}")
-                            continue
-
-                    try:
-                        pagination_container = self.find_element_with_retry(By.CLASS_NAME, "artdeco-pagination__pages")
-                        next_page_button = pagination_container.find_element(
-                            By.XPATH,
-                            f"//button[@aria-label='Page {current_page + 1}']",
-                        )
-                        self.driver.execute_script("arguments[0].click();", next_page_button)
-                        time.sleep(2)
-                        current_page += 1
-                    except NoSuchElementException:
-                        self.log_info("No more pages left.")
-                        break
-                except TimeoutException:
-                    self.log_info("Timeout while waiting for job list container.")
-                    self.log_error("Timeout while waiting for job list container.")
-                    break
-
+            if self.current_location_index >= len(self.locations):
+                break
+            jobs_processed, completed = self.process_job_pages()
+            self.log_run_timing(
+                self.locations[self.current_location_index], time.monotonic() - started, jobs_processed
+            )
+            if completed:
+                self.log_successful_pass()
             self.current_location_index += 1
 
     def apply_collection(self):
@@ -488,84 +919,124 @@ class EasyApplyLinkedin:
             self.log_error(f"Invalid collection: {self.collection}")
             return
 
+        started = time.monotonic()
         self.driver.get(collection_url)
         time.sleep(5)
+        jobs_processed, _ = self.process_job_pages()
+        self.log_run_timing(f"collection:{self.collection}", time.monotonic() - started, jobs_processed)
+
+    def estimate_search_seconds(self, search):
+        durations = [entry["seconds"] for entry in self.run_history.values() if entry["search"] == search]
+        if not durations:
+            durations = [entry["seconds"] for entry in self.run_history.values()]
+        if not durations:
+            return self.DEFAULT_LOCATION_SECONDS
+        return statistics.mean(durations)
+
+    def build_search_plan(self):
+        searches = []
+        if self.collection:
+            search = f"collection:{self.collection}"
+            searches.append({
+                "search": search,
+                "url": self.COLLECTION_URLS.get(self.collection),
+                "estimatedSeconds": round(self.estimate_search_seconds(search)),
+            })
+        else:
+            current_location_index = self.current_location_index
+            for index, location in enumerate(self.locations):
+                self.current_location_index = index
+                searches.append({
+                    "search": location,
+                    "url": self.construct_url(),
+                    "missingGeoId": not self.resolve_geo_id(location),
+                    "estimatedSeconds": round(self.estimate_search_seconds(location)),
+                })
+            self.current_location_index = current_location_index
+
+        return {
+            "created": str(datetime.now()),
+            "historyEntries": len(self.run_history),
+            "estimatedSeconds": sum(search["estimatedSeconds"] for search in searches),
+            "missingGeoIds": [search["search"] for search in searches if search.get("missingGeoId")],
+            "searches": searches,
+        }
 
+    def write_search_plan(self):
+        plan = self.build_search_plan()
+        self.save_json(self.SEARCH_PLAN_PATH, plan)
+        if self.collection and self.collection not in self.COLLECTION_URLS:
+            self.log_error(f"Invalid collection: {self.collection}")
+        for location in plan["missingGeoIds"]:
+            if self.is_geo_id_lookup_due(location):
+                self.log_info(f"No geoId known yet for {location}, it will be looked up with one search UI visit.")
+            else:
+                self.log_info(
+                    f"No geoId was found for {location} at the last lookup, "
+                    f"it is retried {self.GEO_ID_RETRY_HOURS} hours after that lookup."
+                )
+        self.log_info(
+            f"Planned {len(plan['searches'])} searches, estimated duration "
+            f"{timedelta(seconds=plan['estimatedSeconds'])}. Plan written to {self.SEARCH_PLAN_PATH}."
+        )
+        return plan
+
+    def process_job_pages(self):
         current_page = 1
+        jobs_processed = 0
+        self.metrics.current_location.replace(
+            1, label=self.collection or self.locations[self.current_location_index]
+        )
 
         while True:
+            self.metrics.current_page.set(current_page)
             try:
-                WebDriverWait(self.driver, 10).until(
+                self.wait(10).until(
                     EC.presence_of_element_located((By.CLASS_NAME, "scaffold-layout__list-container"))
                 )
 
                 job_list_container = self.find_element_with_retry(By.CLASS_NAME, "scaffold-layout__list-container")
-                job_list_items = job_list_container.find_elements(By.TAG_NAME, "li")
-
-                for index in range(len(job_list_items)):
-                    try:
-                        job_list_container = self.find_element_with_retry(By.CLASS_NAME, "scaffold-layout__list-container")
-                        job_list_items = job_list_container.find_elements(By.TAG_NAME, "li")
-
-                        if index >= len(job_list_items):
-                            break
-
-                        job_item = job_list_items[index]
-                        self.driver.execute_script("arguments[0].scrollIntoView(true);", job_item)
-                        time.sleep(1)
+                job_cards = self.get_job_cards(job_list_container)
+                job_ids = [job_card["id"] for job_card in job_cards]
+                self.metrics.jobs_seen.inc(len(job_ids))
 
-                        try:
-                            self.driver.execute_script("arguments[0].click();", job_item)
-                        except ElementClickInterceptedException:
-                            self.log_info("Element click intercepted, skipping to next job...")
+                if job_ids and all(self.is_recently_seen(job_id) for job_id in job_ids):
+                    self.log_info(f"All jobs on page {current_page} were processed recently, skipping page...")
+                    self.metrics.jobs_skipped.inc(len(job_ids), label="recently_seen")
+                else:
+                    order = self.rank_job_cards(job_cards)
+                    for position, index in enumerate(order):
+                        if self.budget_exhausted():
+                            self.log_info(f"Application budget of {self.application_budget} reached.")
+                            return jobs_processed, False
+                        job_id = job_ids[index]
+                        if self.is_recently_seen(job_id):
+                            self.metrics.jobs_skipped.inc(label="recently_seen")
                             continue
-
-                        time.sleep(2)
-
-                        WebDriverWait(self.driver, 10).until(
-                            EC.presence_of_element_located(
-                                (By.CLASS_NAME, "jobs-search__job-details--wrapper")
-                            )
-                        )
-
-                        company_name = self.get_company_name(job_item)
-
-                        if company_name in self.applied_companies:
-                            self.log_info(f"Already applied to a job at {company_name}, skipping...")
-                            self.close_application_modal()
+                        if self.skip_prefetched_job(job_id):
                             continue
-
-                        job_details_wrapper = self.find_element_with_retry(By.CLASS_NAME, "jobs-search__job-details--wrapper")
-
+                        next_job_id = next(
+                            (
+                                job_ids[next_index]
+                                for next_index in order[position + 1:]
+                                if job_ids[next_index] and not self.is_recently_seen(job_ids[next_index])
+                            ),
+                            None,
+                        )
                         try:
-                            apply_button = job_details_wrapper.find_element(
-                                By.CSS_SELECTOR, "button.jobs-apply-button.artdeco-button--primary"
-                            )
-                            apply_button.click()
-                            time.sleep(2)
-
-                            WebDriverWait(self.driver, 10).until(
-                                EC.presence_of_element_located(
-                                    (By.CSS_SELECTOR, "div.jobs-easy-apply-modal")
-                                )
-                            )
-
-                            try:
-                                self.handle_easy_apply()
-                                self.log_applied_company(company_name)
-                            except Exception as e:
-                                self.log_info(f"Failed to apply at {company_name}: {str(e)}")
-                                self.log_failed_application(company_name)
-
-                        except NoSuchElementException:
-                            self.log_info("No apply button found, continuing to next job...")
+                            if not self.process_job_card(index, job_id, next_job_id):
+                                continue
+                            jobs_processed += 1
+                        except (
+                            NoSuchElementException,
+                            ElementNotInteractableException,
+                            StaleElementReferenceException,
+                            TimeoutException,
+                        ) as e:
+                            self.log_info(f"Exception occurred: {e}, continuing to next job...")
+                            self.log_error(f"Find offers error: {e}")
                             continue
 
-                    except (NoSuchElementException, ElementNotInteractableException, StaleElementReferenceException) as e:
-                        self.log_info(f"Exception occurred: {e}, continuing to next job...")
-                        self.log_error(f"Find offers error: {e}")
-                        continue
-
                 try:
                     pagination_container = self.find_element_with_retry(By.CLASS_NAME, "artdeco-pagination__pages")
                     next_page_button = pagination_container.find_element(
@@ -581,7 +1052,291 @@ class EasyApplyLinkedin:
             except TimeoutException:
                 self.log_info("Timeout while waiting for job list container.")
                 self.log_error("Timeout while waiting for job list container.")
-                break
+                return jobs_processed, False
+
+        return jobs_processed, True
+
+    def process_job_card(self, index, job_id, next_job_id=None):
+        """Open the job card at ``index`` and apply to it; return False once the list runs out."""
+        if self.tracer is not None:
+            self.tracer.mark_job()
+        job_list_container = self.find_element_with_retry(By.CLASS_NAME, "scaffold-layout__list-container")
+        job_list_items = job_list_container.find_elements(By.TAG_NAME, "li")
+
+        if index >= len(job_list_items):
+            return False
+
+        job_item = job_list_items[index]
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", job_item)
+        time.sleep(1)
+
+        try:
+            self.driver.execute_script("arguments[0].click();", job_item)
+        except ElementClickInterceptedException:
+            self.log_info("Element click intercepted, skipping to next job...")
+            return True
+
+        time.sleep(2)
+
+        self.wait(10).until(
+            EC.presence_of_element_located(
+                (By.CLASS_NAME, "jobs-search__job-details--wrapper")
+            )
+        )
+
+        company_name = self.get_company_name(job_item)
+        job_details = self.get_job_details()
+
+        if self.job_catalog.is_unchanged(job_id, job_details["description_hash"]):
+            self.log_info(f"Job {job_id} at {company_name} is unchanged since the last run, skipping...")
+            self.record_seen_job(job_id, self.job_catalog.get_job(job_id)["outcome"])
+            self.metrics.jobs_skipped.inc(label="unchanged")
+            return True
+
+        if company_name in self.applied_companies:
+            self.log_info(f"Already applied to a job at {company_name}, skipping...")
+            self.record_job_outcome(job_id, job_details, "already_applied_company")
+            self.close_application_modal()
+            return True
+
+        job_details_wrapper = self.find_element_with_retry(By.CLASS_NAME, "jobs-search__job-details--wrapper")
+
+        try:
+            self.open_easy_apply_modal(job_details_wrapper)
+            self.start_prefetch(next_job_id)
+            self.apply_to_open_job(job_id, company_name, job_details)
+            self.collect_prefetch()
+
+        except NoSuchElementException:
+            self.log_info("No apply button found, continuing to next job...")
+            self.record_job_outcome(job_id, job_details, "no_easy_apply")
+        except TimeoutException as e:
+            cause = self.classify_failure(e)
+            self.log_info(f"Easy apply modal did not open at {company_name} ({cause}), continuing to next job...")
+            self.log_failed_application(company_name, cause, job_id, "Easy apply modal did not open")
+            self.record_job_outcome(job_id, job_details, f"failed_{cause}")
+
+        return True
+
+    def open_easy_apply_modal(self, container):
+        apply_button = container.find_element(
+            By.CSS_SELECTOR, "button.jobs-apply-button.artdeco-button--primary"
+        )
+        apply_button.click()
+        time.sleep(2)
+
+        self.wait(10).until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "div.jobs-easy-apply-modal")
+            )
+        )
+
+    def apply_to_open_job(self, job_id, company_name, job_details):
+        try:
+            self.handle_easy_apply()
+            self.log_applied_company(company_name)
+            self.record_job_outcome(job_id, job_details, "applied")
+            return True
+        except Exception as e:
+            cause = self.classify_failure(e)
+            self.log_info(f"Failed to apply at {company_name} ({cause}): {str(e)}")
+            self.log_failed_application(company_name, cause, job_id, str(e))
+            self.record_job_outcome(job_id, job_details, f"failed_{cause}")
+            return False
+
+    def drain_retry_queue(self):
+        due_retries = self.get_due_retries()
+        if not due_retries:
+            return
+        self.log_info(f"Retrying {len(due_retries)} failed applications.")
+        current_location_index = self.current_location_index
+        for job_id in due_retries:
+            entry = self.retry_queue[job_id]
+            catalog_entry = self.job_catalog.get_job(job_id)
+            if entry["company"] in self.applied_companies or (catalog_entry and catalog_entry["outcome"] == "applied"):
+                self.log_info(f"Already applied to a job at {entry['company']}, dropping the retry for job {job_id}.")
+                self.retry_queue.pop(job_id, None)
+                self.save_json(self.RETRY_QUEUE_PATH, self.retry_queue)
+                continue
+            if entry["search"] in self.locations:
+                self.current_location_index = self.locations.index(entry["search"])
+            try:
+                self.driver.get(self.JOB_VIEW_URL.format(job_id))
+                self.wait(10).until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, ".job-details-jobs-unified-top-card__job-title")
+                    )
+                )
+                job_details = self.get_job_details()
+                try:
+                    self.open_easy_apply_modal(self.driver)
+                except NoSuchElementException:
+                    self.log_info(f"Job {job_id} at {entry['company']} no longer accepts Easy Apply applications.")
+                    self.log_failed_application(entry["company"], self.FAILURE_PERMANENT, job_id)
+                    self.record_job_outcome(job_id, job_details, "no_easy_apply")
+                    continue
+                if self.apply_to_open_job(job_id, entry["company"], job_details):
+                    self.retry_queue.pop(job_id, None)
+                    self.save_json(self.RETRY_QUEUE_PATH, self.retry_queue)
+            except (TimeoutException, WebDriverException) as e:
+                self.log_info(f"Could not open job {job_id} for a retry: {e}")
+                self.enqueue_retry(job_id, entry["company"], str(e))
+        self.current_location_index = current_location_index
+
+    def start_prefetch(self, job_id):
+        if not self.prefetch_enabled or not job_id or job_id in self.prefetched_jobs:
+            return
+        try:
+            self.main_window = self.driver.current_window_handle
+            if self.prefetch_window is None:
+                self.driver.switch_to.new_window("tab")
+                self.prefetch_window = self.driver.current_window_handle
+            else:
+                self.driver.switch_to.window(self.prefetch_window)
+            self.driver.execute_script("window.location.href = arguments[0];", self.JOB_VIEW_URL.format(job_id))
+            self.prefetch_job_id = job_id
+        except WebDriverException as e:
+            self.log_info(f"Prefetch of job {job_id} failed, disabling prefetch: {e}")
+            self.prefetch_enabled = False
+        finally:
+            self.switch_to_main_window()
+
+    def collect_prefetch(self):
+        if not self.prefetch_job_id:
+            return
+        job_id = self.prefetch_job_id
+        self.prefetch_job_id = None
+        try:
+            self.driver.switch_to.window(self.prefetch_window)
+            self.wait(5).until(
+                EC.presence_of_element_located(
+                    (By.CSS_SELECTOR, ".job-details-jobs-unified-top-card__job-title")
+                )
+            )
+            self.prefetched_jobs[job_id] = self.get_job_details()
+            self.remember_applicants(job_id, self.prefetched_jobs[job_id])
+        except TimeoutException:
+            self.log_info(f"Prefetched job {job_id} did not load in time.")
+        except WebDriverException as e:
+            self.log_info(f"Could not collect prefetched job {job_id}: {e}")
+        finally:
+            self.switch_to_main_window()
+
+    def switch_to_main_window(self):
+        if self.main_window is not None:
+            try:
+                self.driver.switch_to.window(self.main_window)
+            except WebDriverException as e:
+                self.log_error(f"Could not switch back to the main window: {e}")
+
+    def get_prefetch_skip_outcome(self, job_details):
+        if job_details["easy_apply"] is False and job_details["title"]:
+            return "no_easy_apply"
+        if job_details["company"] and job_details["company"] in self.applied_companies:
+            return "already_applied_company"
+        if self.keywords_to_avoid_pattern and self.keywords_to_avoid_pattern.search(job_details["title"]):
+            return "excluded"
+        return None
+
+    def skip_prefetched_job(self, job_id):
+        job_details = self.prefetched_jobs.pop(job_id, None)
+        if job_details is None:
+            return False
+        outcome = self.get_prefetch_skip_outcome(job_details)
+        if outcome is None:
+            return False
+        self.log_info(f"Skipping prefetched job {job_id} ({job_details['title']}): {outcome}")
+        self.record_job_outcome(job_id, job_details, outcome)
+        return True
+
+    def get_job_details(self):
+        try:
+            details = self.driver.execute_script(self.JOB_DETAILS_SCRIPT) or {}
+        except WebDriverException as e:
+            self.log_info(f"Could not read job details: {e}")
+            details = {}
+        description = details.get("description", "")
+        parts = [part.strip() for part in details.get("primaryDescription", "").split("·")]
+        applicants = self.APPLICANTS_PATTERN.search(parts[2].lower()) if len(parts) > 2 else None
+        return {
+            "title": details.get("title", ""),
+            "company": details.get("company", ""),
+            "location": parts[0] if parts else "",
+            "posted": parts[1] if len(parts) > 1 else "",
+            "applicants": int(applicants.group(1).replace(",", "")) if applicants else None,
+            "easy_apply": details.get("easyApply"),
+            "description_hash": hashlib.sha1(description.encode("utf-8")).hexdigest() if description else None,
+        }
+
+    def remember_applicants(self, job_id, job_details):
+        if job_id and job_details.get("applicants") is not None:
+            self.job_applicants[job_id] = job_details["applicants"]
+
+    def record_job_outcome(self, job_id, job_details, outcome):
+        if outcome == "applied":
+            self.applications_submitted += 1
+            self.metrics.jobs_applied.inc()
+        elif outcome.startswith("failed"):
+            self.metrics.jobs_failed.inc()
+        else:
+            self.metrics.jobs_skipped.inc(label=outcome)
+        self.record_seen_job(job_id, outcome)
+        self.remember_applicants(job_id, job_details)
+        self.job_catalog.record_job(
+            job_id, outcome, **{key: value for key, value in job_details.items() if key != "applicants"}
+        )
+
+    def get_job_cards(self, job_list_container):
+        if self.ranking is not None:
+            # Occluded cards stay empty shells until scrolled into view, so render them before scoring.
+            self.driver.execute_script(self.RENDER_JOB_CARDS_SCRIPT, job_list_container)
+            time.sleep(1)
+        return self.driver.execute_script(self.JOB_CARDS_SCRIPT, job_list_container) or []
+
+    def rank_job_cards(self, job_cards):
+        if self.ranking is None:
+            return list(range(len(job_cards)))
+        scores = self.score_job_cards(job_cards)
+        self.job_scores.extend(scores)
+        for score in scores:
+            self.metrics.job_score.observe(score)
+        return sorted(range(len(job_cards)), key=lambda index: scores[index], reverse=True)
+
+    def score_job_cards(self, job_cards):
+        titles = [job_card["title"].lower() for job_card in job_cards]
+        texts = [job_card["text"].lower() for job_card in job_cards]
+        keyword_weights = self.ranking["keyword_weights"]
+        text_keywords = [set(self.ranking["keyword_pattern"].findall(text)) for text in texts]
+        title_keywords = [set(self.ranking["keyword_pattern"].findall(title)) for title in titles]
+        workplaces = [set(self.ranking["workplace_pattern"].findall(text)) for text in texts]
+        applicants = []
+        for job_card, text in zip(job_cards, texts):
+            match = self.ranking["applicant_pattern"].search(text)
+            applicants.append(
+                int(match.group(1).replace(",", "")) if match else self.job_applicants.get(job_card["id"])
+            )
+        return [
+            sum(keyword_weights[keyword] for keyword in text_matches)
+            + self.ranking["title_match_weight"] * sum(keyword_weights[keyword] for keyword in title_matches)
+            + sum(self.ranking["workplace_weights"][workplace] for workplace in workplace_matches)
+            + (self.ranking["applicant_weight"] * applicant_count if applicant_count is not None else 0)
+            for text_matches, title_matches, workplace_matches, applicant_count in zip(
+                text_keywords, title_keywords, workplaces, applicants
+            )
+        ]
+
+    def budget_exhausted(self):
+        return self.application_budget is not None and self.applications_submitted >= self.application_budget
+
+    def log_score_distribution(self):
+        if not self.job_scores:
+            return
+        scores = sorted(self.job_scores)
+        quartiles = statistics.quantiles(scores, n=4) if len(scores) > 1 else [scores[0]] * 3
+        self.log_info(
+            f"Scored {len(scores)} jobs: min {scores[0]:.1f}, 25% {quartiles[0]:.1f}, median {quartiles[1]:.1f}, "
+            f"75% {quartiles[2]:.1f}, max {scores[-1]:.1f}. Applied to {self.applications_submitted}."
+        )
 
     def get_company_name(self, job_item):
         try:
@@ -593,122 +1348,245 @@ class EasyApplyLinkedin:
         except NoSuchElementException:
             return None
 
+    def classify_easy_apply_step(self, modal_dialog):
+        return self.driver.execute_script(self.EASY_APPLY_STEP_SCRIPT, modal_dialog)
+
     def handle_easy_apply(self):
-        while True:
+        previous_signature = None
+        for _ in range(self.EASY_APPLY_MAX_STEPS):
             try:
-                modal_dialog = WebDriverWait(self.driver, 10).until(
+                modal_dialog = self.wait(10).until(
                     EC.presence_of_element_located(
                         (By.CSS_SELECTOR, "div.artdeco-modal--layer-default.jobs-easy-apply-modal")
                     )
                 )
-                try:
-                    next_button = modal_dialog.find_element(
-                        By.CSS_SELECTOR, "button[data-easy-apply-next-button]"
+                step = self.classify_easy_apply_step(modal_dialog)
+                if step["kind"] == self.EASY_APPLY_STEP_UNKNOWN:
+                    self.close_application_modal()
+                    raise EasyApplyError(self.FAILURE_PERMANENT, "Submit button not found")
+
+                signature = (step["kind"], step["progress"], tuple(field["label"] for field in step["fields"]))
+                if signature == previous_signature:
+                    self.close_application_modal()
+                    raise EasyApplyError(
+                        self.FAILURE_UNKNOWN_QUESTION,
+                        f"Easy apply form did not advance past {step['progress']}%",
                     )
-                    self.driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(2)
-                except NoSuchElementException:
-                    try:
-                        review_button = modal_dialog.find_element(
-                            By.CSS_SELECTOR, "button[aria-label='Review your application']"
-                        )
-                        self.driver.execute_script("arguments[0].click();", review_button)
-                        time.sleep(2)
-                    except NoSuchElementException:
-                        try:
-                            submit_button = modal_dialog.find_element(
-                                By.CSS_SELECTOR, "button[aria-label='Submit application']"
-                            )
-                            self.driver.execute_script("arguments[0].click();", submit_button)
-                            time.sleep(2)
-                            self.log_info("Application submitted.")
-                            self.handle_done_button()
-                            break
-                        except NoSuchElementException:
-                            self.log_info("Submit button not found, continuing to next job...")
-                            self.close_application_modal()
-                            break
-                self.fill_form(modal_dialog)
-            except TimeoutException:
-                self.log_info("No more steps found, exiting...")
-                break
+                previous_signature = signature
+
+                self.fill_form(modal_dialog, step["fields"])
+                self.driver.execute_script("arguments[0].click();", step["button"])
+                time.sleep(2)
+
+                if step["kind"] == self.EASY_APPLY_STEP_SUBMIT:
+                    self.log_info("Application submitted.")
+                    self.handle_done_button()
+                    return
+            except EasyApplyError:
+                raise
+            except TimeoutException as e:
+                raise EasyApplyError(self.FAILURE_TRANSIENT, "Easy apply modal disappeared before submitting") from e
             except Exception as e:
-                self.log_info(f"Error during easy apply: {e}, skipping to next job...")
                 self.log_error(f"Easy apply error: {e}")
                 self.close_application_modal()
-                break
+                raise EasyApplyError(self.classify_failure(e), str(e)) from e
 
-    def fill_form(self, modal_dialog):
-        form_elements = modal_dialog.find_elements(
-            By.CSS_SELECTOR, "div[data-test-form-element], fieldset[data-test-form-builder-radio-button-form-component], fieldset[data-test-checkbox-form-component], div[data-test-text-entity-list-form-component]"
+        self.close_application_modal()
+        raise EasyApplyError(
+            self.FAILURE_PERMANENT, f"Easy apply form has more than {self.EASY_APPLY_MAX_STEPS} steps"
         )
-        for element in form_elements:
-            try:
-                label = element.find_element(By.CSS_SELECTOR, "label, legend, span[aria-hidden='true']")
-                label_text = label.text.strip()
-
-                if "data-test-checkbox-form-component" in element.get_attribute("outerHTML"):
-                    self.handle_checkboxes(element)
-                elif "data-test-text-entity-list-form-component" in element.get_attribute("outerHTML"):
-                    select_element = element.find_element(By.CSS_SELECTOR, "select")
-                    options = [option.text for option in select_element.find_elements(By.TAG_NAME, "option")]
-                    response = self.get_radio_response_for_label(label_text, options[1:])
-                    for option in select_element.find_elements(By.TAG_NAME, "option"):
-                        if option.text == response:
-                            option.click()
-                            break
-                else:
-                    input_field = element.find_element(By.CSS_SELECTOR, "input, select, textarea")
-
-                    if input_field.tag_name == "input" and input_field.get_attribute("type") == "text":
-                        response = self.get_response_for_label(label_text)
-                        if input_field.get_attribute("value") == "":
-                            input_field.send_keys(response)
-                            time.sleep(1)
-                            input_field.send_keys(Keys.ARROW_DOWN)
-                            input_field.send_keys(Keys.RETURN)
-
-                    elif input_field.tag_name == "select":
-                        response = self.get_response_for_label(label_text)
-                        select_options = input_field.find_elements(By.TAG_NAME, "option")
-                        for option in select_options:
-                            if option.get_attribute("value") == response:
-                                option.click()
-                                break
-
-                    elif input_field.tag_name == "textarea":
-                        response = self.get_response_for_label(label_text)
-                        if input_field.get_attribute("value") == "":
-                            input_field.send_keys(response)
-
-                    elif input_field.tag_name == "input" and input_field.get_attribute("type") == "radio":
-                        radio_buttons = element.find_elements(By.CSS_SELECTOR, "input[type='radio']")
-                        for radio in radio_buttons:
-                            radio_label = radio.find_element(By.XPATH, "./following-sibling::label").text.strip()
-                            response = self.get_radio_response_for_label(label_text, [rb.find_element(By.XPATH, "./following-sibling::label").text.strip() for rb in radio_buttons])
-                            if response.lower() == radio_label.lower():
-                                try:
-                                    radio.click()
-                                except ElementClickInterceptedException:
-                                    self.driver.execute_script("arguments[0].click();", radio)
-                                break
-
-                    elif input_field.tag_name == "input" and input_field.get_attribute("type") == "file":
-                        response = self.get_file_response_for_label(label_text)
-                        input_field.send_keys(response)
-                        time.sleep(1)
 
+    def classify_failure(self, exception):
+        if isinstance(exception, EasyApplyError):
+            return exception.cause
+        if isinstance(exception, (
+            TimeoutException,
+            StaleElementReferenceException,
+            ElementClickInterceptedException,
+            ElementNotInteractableException,
+        )):
+            return self.FAILURE_TRANSIENT
+        if isinstance(exception, NoSuchElementException):
+            return self.FAILURE_PERMANENT
+        if isinstance(exception, WebDriverException):
+            return self.FAILURE_TRANSIENT
+        return self.FAILURE_PERMANENT
+
+    def fill_form(self, modal_dialog, fields=None):
+        if fields is None:
+            fields = self.classify_easy_apply_step(modal_dialog)["fields"]
+        if not fields:
+            return
+        plan_key = self.get_form_plan_key(fields)
+        if self.apply_form_plan(plan_key, fields):
+            return
+
+        location_specific_inputs = self.context_data["user_inputs"].get(
+            self.locations[self.current_location_index], {}
+        )
+        pending = [field["kind"] != "checkbox" and field["label"] not in location_specific_inputs for field in fields]
+        self.metrics.pending_questions.set(sum(pending))
+        answers = []
+        for field, is_pending in zip(fields, pending):
+            try:
+                answers.append(self.fill_field(field))
             except NoSuchElementException:
-                continue
+                answers.append(None)
+            if is_pending:
+                self.metrics.pending_questions.dec()
+        self.store_form_plan(plan_key, fields, answers)
+
+    def get_form_plan_key(self, fields):
+        signature = json.dumps([[field["label"], field["kind"]] for field in fields])
+        fingerprint = hashlib.sha1(signature.encode("utf-8")).hexdigest()[:16]
+        return f"{self.locations[self.current_location_index]}:{fingerprint}"
+
+    def get_form_plan_answer(self, planned_field):
+        current_location = self.locations[self.current_location_index]
+        location_specific_inputs = self.context_data["user_inputs"].get(current_location, {})
+        if planned_field["kind"] == "checkbox":
+            return {
+                label: location_specific_inputs.get(label, answer)
+                for label, answer in planned_field["answer"].items()
+            }
+        return location_specific_inputs.get(planned_field["label"], planned_field["answer"])
+
+    def apply_form_plan(self, plan_key, fields):
+        plan = self.form_plans.get(plan_key)
+        if plan is None:
+            self.form_plan_stats["misses"] += 1
+            return False
 
+        batched = []
         try:
-            next_button = modal_dialog.find_element(By.CSS_SELECTOR, "button[data-easy-apply-next-button]")
-            next_button.click()
-            time.sleep(2)
-        except NoSuchElementException:
-            self.log_info("Next button not found, form might be complete or there is an issue.")
+            for field, planned_field in zip(fields, plan["fields"]):
+                answer = self.get_form_plan_answer(planned_field)
+                if field["kind"] == "file" or field.get("typeahead"):
+                    if field["kind"] == "file" or field["value"] == "":
+                        field["input"].send_keys(answer)
+                        time.sleep(1)
+                    if field.get("typeahead") and field["value"] == "":
+                        field["input"].send_keys(Keys.ARROW_DOWN)
+                        field["input"].send_keys(Keys.RETURN)
+                else:
+                    batched.append([field["element"], field["input"], field["kind"], answer])
+            if batched:
+                self.driver.execute_script(self.FORM_PLAN_SCRIPT, batched)
+        except WebDriverException as e:
+            self.log_info(f"Cached fill plan failed, filling the form field by field: {e}")
+            self.form_plan_stats["misses"] += 1
+            return False
+
+        self.form_plan_stats["hits"] += 1
+        plan["last_used"] = str(datetime.now())
+        plan["hits"] = plan.get("hits", 0) + 1
+        self.save_json(self.FORM_PLAN_CACHE_PATH, self.form_plans)
+        return True
+
+    def store_form_plan(self, plan_key, fields, answers):
+        if any(answer is None for answer in answers):
+            return
+        now = str(datetime.now())
+        self.form_plans[plan_key] = {
+            "fields": [
+                {"label": field["label"], "kind": field["kind"], "answer": answer}
+                for field, answer in zip(fields, answers)
+            ],
+            "created": now,
+            "last_used": now,
+            "hits": 0,
+        }
+        self.cleanup_form_plan_cache()
+
+    def cleanup_form_plan_cache(self):
+        cutoff = datetime.now() - timedelta(days=self.FORM_PLAN_TTL_DAYS)
+        plans = sorted(
+            (
+                (k, v)
+                for k, v in self.form_plans.items()
+                if datetime.fromisoformat(v["last_used"]) > cutoff
+            ),
+            key=lambda item: item[1]["last_used"],
+            reverse=True,
+        )
+        self.form_plans = dict(plans[:self.FORM_PLAN_MAX_ENTRIES])
+        self.save_json(self.FORM_PLAN_CACHE_PATH, self.form_plans)
+
+    def log_form_plan_stats(self):
+        lookups = self.form_plan_stats["hits"] + self.form_plan_stats["misses"]
+        if lookups:
+            self.log_info(
+                f"Form plan cache: {self.form_plan_stats['hits']} hits, {self.form_plan_stats['misses']} misses "
+                f"({self.form_plan_stats['hits'] / lookups:.0%} hit rate), {len(self.form_plans)} plans cached."
+            )
+
+    def fill_field(self, field):
+        element = field["element"]
+        input_field = field["input"]
+        label_text = field["label"]
+
+        if field["kind"] == "checkbox":
+            return self.handle_checkboxes(element)
+
+        elif field["kind"] == "entity_list":
+            select_options = input_field.find_elements(By.TAG_NAME, "option")
+            options = [option.text for option in select_options]
+            response = self.get_radio_response_for_label(label_text, options[1:])
+            for option in select_options:
+                if option.text == response:
+                    option.click()
+                    break
+            return response
+
+        elif field["kind"] == "text":
+            response = self.get_response_for_label(label_text)
+            if field["value"] == "":
+                input_field.send_keys(response)
+                time.sleep(1)
+                input_field.send_keys(Keys.ARROW_DOWN)
+                input_field.send_keys(Keys.RETURN)
+            return response
+
+        elif field["kind"] == "select":
+            response = self.get_response_for_label(label_text)
+            select_options = input_field.find_elements(By.TAG_NAME, "option")
+            for option in select_options:
+                if option.get_attribute("value") == response:
+                    option.click()
+                    break
+            return response
+
+        elif field["kind"] == "textarea":
+            response = self.get_response_for_label(label_text)
+            if field["value"] == "":
+                input_field.send_keys(response)
+            return response
+
+        elif field["kind"] == "radio":
+            radio_buttons = element.find_elements(By.CSS_SELECTOR, "input[type='radio']")
+            radio_labels = [
+                radio.find_element(By.XPATH, "./following-sibling::label").text.strip() for radio in radio_buttons
+            ]
+            response = self.get_radio_response_for_label(label_text, radio_labels)
+            for radio, radio_label in zip(radio_buttons, radio_labels):
+                if response.lower() == radio_label.lower():
+                    try:
+                        radio.click()
+                    except ElementClickInterceptedException:
+                        self.driver.execute_script("arguments[0].click();", radio)
+                    break
+            return response
+
+        elif field["kind"] == "file":
+            response = self.get_file_response_for_label(label_text)
+            input_field.send_keys(response)
+            time.sleep(1)
+            return response
+
+        return None
 
     def handle_checkboxes(self, element):
+        answers = {}
         checkboxes = element.find_elements(By.CSS_SELECTOR, "input[type='checkbox']")
         for index in range(len(checkboxes)):
             checkbox_label = None
@@ -718,12 +1596,15 @@ class EasyApplyLinkedin:
                 response = self.get_checkbox_response_for_label(checkbox_label)
                 if response is not None:
                     self.set_checkbox_state(checkbox, checkbox_label, response)
+                    answers[checkbox_label] = response
             except (ElementClickInterceptedException, StaleElementReferenceException) as e:
                 self.log_info(f"Checkbox interaction failed for {checkbox_label}, attempting to retry. Error: {e}")
-                self.retry_checkbox_interaction(element, index)
+                answers.update(self.retry_checkbox_interaction(element, index))
+        return answers
 
     def retry_checkbox_interaction(self, element, index):
         retries = 3
+        checkbox_label = None
         while retries > 0:
             retries -= 1
             try:
@@ -733,11 +1614,13 @@ class EasyApplyLinkedin:
                 response = self.get_checkbox_response_for_label(checkbox_label)
                 if response is not None:
                     self.set_checkbox_state(checkbox, checkbox_label, response)
-                return
+                    return {checkbox_label: response}
+                return {}
             except (NoSuchElementException, StaleElementReferenceException) as e:
                 self.log_info(f"Retry failed for {checkbox_label}. Error: {e}")
                 if retries == 0:
                     self.log_info(f"Skipping {checkbox_label} after multiple retries.")
+        return {}
 
     def set_checkbox_state(self, checkbox, checkbox_label, response):
         if response and not checkbox.is_selected():
@@ -764,7 +1647,7 @@ class EasyApplyLinkedin:
 
     def handle_done_button(self):
         try:
-            done_button = WebDriverWait(self.driver, 10).until(
+            done_button = self.wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, "button.artdeco-button.artdeco-button--primary"))
             )
             done_button.click()
@@ -774,7 +1657,7 @@ class EasyApplyLinkedin:
 
     def close_application_modal(self):
         try:
-            close_button = WebDriverWait(self.driver, 10).until(
+            close_button = self.wait(10).until(
                 EC.presence_of_element_located(
                     (
                         By.CSS_SELECTOR,
@@ -790,7 +1673,7 @@ class EasyApplyLinkedin:
 
     def handle_discard_dialog(self):
         try:
-            discard_button = WebDriverWait(self.driver, 10).until(
+            discard_button = self.wait(10).until(
                 EC.presence_of_element_located(
                     (By.CSS_SELECTOR, "button[data-control-name='discard_application_confirm_btn']")
                 )
@@ -802,17 +1685,85 @@ class EasyApplyLinkedin:
 
     def close_session(self):
         self.log_info("End of the session")
-        self.driver.close()
-        self.driver.quit()
+        if self.job_catalog is not None:
+            self.job_catalog.close()
+        self.log_form_plan_stats()
+        self.log_trace_report()
+        self.log_score_distribution()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        if self.driver_started:
+            self.driver.close()
+            self.driver.quit()
+
+    def ensure_logged_in(self):
+        current_url = self.driver.current_url
+        if "/login" in current_url or "/authwall" in current_url or "/checkpoint" in current_url:
+            self.log_info("Session expired, logging in again.")
+            self.login_linkedin()
+
+    def run_daemon(self):
+        self.incremental = True
+        if self.collection:
+            self.log_info("Collections cannot be filtered by posting time, every pass will scan the whole collection.")
+        self.login_linkedin()
+        needs_login = False
+        while True:
+            started = time.monotonic()
+            try:
+                if needs_login:
+                    self.login_linkedin()
+                    needs_login = False
+                else:
+                    self.ensure_logged_in()
+                self.current_location_index = 0
+                self.find_offers()
+            except WebDriverException as e:
+                self.log_error(f"Daemon pass failed, restarting the browser for the next pass: {e}")
+                self.reset_driver()
+                needs_login = True
+            except Exception as e:
+                self.log_error(f"Daemon pass failed, retrying at the next interval: {e}")
+            elapsed = time.monotonic() - started
+            sleep_seconds = max(self.daemon_interval.total_seconds() - elapsed, 0)
+            self.log_info(
+                f"Pass finished in {timedelta(seconds=int(elapsed))}, "
+                f"next pass in {timedelta(seconds=int(sleep_seconds))}."
+            )
+            time.sleep(sleep_seconds)
 
     def handle_captcha(self):
         input("CAPTCHA detected. Please solve the CAPTCHA manually and then press Enter to continue...")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply to LinkedIn Easy Apply jobs.")
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="write the search URLs and an estimated duration to search_plan.json without opening the browser",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="keep the browser open and search again every daemonIntervalMinutes for jobs posted since the last pass",
+    )
+    args = parser.parse_args()
+
     with open("config.json") as config_file:
         data = json.load(config_file)
-    bot = EasyApplyLinkedin(data)
-    bot.login_linkedin()
-    bot.job_search()
-    bot.find_offers()
-    bot.close_session()
+
+    if args.plan:
+        EasyApplyLinkedin(data, plan_only=True).write_search_plan()
+    else:
+        bot = EasyApplyLinkedin(data, prelaunch=True)
+        if args.daemon:
+            try:
+                bot.run_daemon()
+            except KeyboardInterrupt:
+                bot.log_info("Daemon stopped.")
+            finally:
+                bot.close_session()
+        else:
+            bot.login_linkedin()
+            bot.find_offers()
+            bot.close_session()
@@ -0,0 +1,147 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def format_labels(label_name, label, extra=""):
+    labels = []
+    if label_name is not None and label is not None:
+        escaped = str(label).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        labels.append(f'{label_name}="{escaped}"')
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Metric:
+    metric_type = "untyped"
+
+    def __init__(self, name, documentation, label_name=None):
+        self.name = name
+        self.documentation = documentation
+        self.label_name = label_name
+        self.values = {}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for label, value in list(self.values.items()):
+            lines.append(f"{self.name}{format_labels(self.label_name, label)} {value}")
+        return lines
+
+
+class Counter(Metric):
+    metric_type = "counter"
+
+    def __init__(self, name, documentation, label_name=None):
+        super().__init__(name, documentation, label_name)
+        if label_name is None:
+            self.values[None] = 0
+
+    def inc(self, amount=1, label=None):
+        self.values[label] = self.values.get(label, 0) + amount
+
+
+class Gauge(Metric):
+    metric_type = "gauge"
+
+    def set(self, value, label=None):
+        self.values[label] = value
+
+    def replace(self, value, label=None):
+        self.values = {label: value}
+
+    def inc(self, amount=1, label=None):
+        self.values[label] = self.values.get(label, 0) + amount
+
+    def dec(self, amount=1, label=None):
+        self.values[label] = max(self.values.get(label, 0) - amount, 0)
+
+
+class Histogram(Metric):
+    metric_type = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name, documentation, label_name=None, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_name)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, label=None):
+        series = self.values.get(label)
+        if series is None:
+            series = self.values[label] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+        series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+        series["sum"] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"]
+        for label, series in list(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = format_labels(self.label_name, label, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_name, label)} {series['sum']}")
+            lines.append(f"{self.name}_count{format_labels(self.label_name, label)} {cumulative}")
+        return lines
+
+
+class BotMetrics:
+    def __init__(self):
+        self.jobs_seen = Counter("easyapply_jobs_seen_total", "Job cards found on result pages.")
+        self.jobs_skipped = Counter("easyapply_jobs_skipped_total", "Jobs skipped without applying.", "reason")
+        self.jobs_applied = Counter("easyapply_jobs_applied_total", "Applications submitted.")
+        self.jobs_failed = Counter("easyapply_jobs_failed_total", "Applications that failed.")
+        self.wait_timeouts = Counter("easyapply_wait_timeouts_total", "WebDriverWait calls that timed out.")
+        self.webdriver_command_seconds = Histogram(
+            "easyapply_webdriver_command_seconds", "Latency of WebDriver commands.", "command"
+        )
+        self.job_score = Histogram(
+            "easyapply_job_score", "Relevance scores of ranked job cards.", buckets=(0, 1, 2, 5, 10, 20, 50)
+        )
+        self.current_location = Gauge("easyapply_current_location", "Search currently being processed.", "search")
+        self.current_page = Gauge("easyapply_current_page", "Result page currently being processed.")
+        self.pending_questions = Gauge(
+            "easyapply_pending_questions", "Form questions on the current step still waiting for an answer."
+        )
+
+    def render(self):
+        lines = []
+        for metric in vars(self).values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?")[0] != "/metrics":
+                    handler.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, kwargs={"poll_interval": 0.1}, name="metrics-server", daemon=True
+        )
+
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
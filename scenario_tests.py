@@ -0,0 +1,117 @@
+import copy
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from selenium.webdriver.remote.command import Command
+from fake_webdriver import FakeWebDriver, load_scenario
+from job_catalog import JobCatalog
+from main import EasyApplyLinkedin
+
+SCENARIOS_PATH = Path(__file__).resolve().parent / "scenarios"
+
+class TestScenarios(unittest.TestCase):
+    def setUp(self):
+        self.data = {
+            "email": "sendmessage@gabo.email",
+            "password": "bp8v9fvk#?QaKe7",
+            "keywords": ["TypeScript", "Angular", "React"],
+            "keywordsToAvoid": ["C++", ".NET"],
+            "locations": ["Switzerland"],
+            "driver_path": "/usr/local/bin/geckodriver",
+            "sortBy": "R",
+            "filters": {
+                "easy_apply": True,
+                "experience": [],
+                "jobType": ["Full-time", "Contract"],
+                "timePostedRange": [],
+                "workplaceType": ["Remote", "Hybrid"],
+                "less_than_10_applicants": False
+            }
+        }
+        working_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(working_directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(working_directory.name)
+
+    def run_scenario(self, name, **config):
+        scenario = load_scenario(SCENARIOS_PATH / f"{name}.json")
+        data = copy.deepcopy(self.data)
+        data.update(copy.deepcopy(scenario.get("config", {})))
+        data.update(config)
+        driver = FakeWebDriver(scenario, script_source=EasyApplyLinkedin)
+        started = time.perf_counter()
+        with driver.clock.patch("main", "selenium.webdriver.support.wait"), \
+                patch("builtins.input", side_effect=AssertionError("unexpected prompt")) as mock_input:
+            bot = EasyApplyLinkedin(data, driver_factory=lambda: driver)
+            bot.login_linkedin()
+            bot.find_offers()
+            bot.close_session()
+        self.assertLess(time.perf_counter() - started, 1.0)
+        mock_input.assert_not_called()
+        return bot, driver
+
+    def get_outcome(self, bot, job_id):
+        catalog = JobCatalog(bot.JOB_CATALOG_PATH)
+        self.addCleanup(catalog.close)
+        job = catalog.get_job(job_id)
+        return job["outcome"] if job else None
+
+    def test_multi_step_apply(self):
+        bot, driver = self.run_scenario("multi_step_apply")
+        self.assertEqual(driver.applied, {"101", "103"})
+        self.assertEqual(set(bot.applied_companies), {"Acme", "Initech"})
+        self.assertEqual(self.get_outcome(bot, "102"), "no_easy_apply")
+        self.assertEqual(driver.selected_jobs, ["101", "102", "103"])
+        self.assertEqual(bot.form_plan_stats, {"hits": 2, "misses": 2})
+        self.assertEqual(len(bot.last_successful_passes), 1)
+        counts = driver.command_counts
+        self.assertLessEqual(counts[Command.GET], 2)
+        self.assertLessEqual(counts[Command.W3C_EXECUTE_SCRIPT], 30)
+        self.assertLessEqual(counts[Command.SEND_KEYS_TO_ELEMENT], 15)
+        self.assertLessEqual(counts[Command.FIND_ELEMENT], 40)
+        self.assertEqual(counts[Command.NEW_WINDOW], 0)
+
+    def test_prefetch_skips_job_without_opening_it(self):
+        bot, driver = self.run_scenario("multi_step_apply", prefetchNextJob=True)
+        self.assertEqual(driver.applied, {"101", "103"})
+        self.assertEqual(driver.selected_jobs, ["101", "103"])
+        self.assertEqual(self.get_outcome(bot, "102"), "no_easy_apply")
+        self.assertEqual(driver.command_counts[Command.NEW_WINDOW], 1)
+
+    def test_recently_seen_jobs_are_not_reopened(self):
+        self.run_scenario("multi_step_apply")
+        bot, driver = self.run_scenario("multi_step_apply")
+        self.assertEqual(driver.selected_jobs, [])
+        self.assertEqual(driver.applied, set())
+        self.assertEqual(driver.command_counts[Command.CLICK_ELEMENT], 0)
+
+    def test_faults(self):
+        bot, driver = self.run_scenario("flaky_results")
+        self.assertEqual(driver.applied, {"206"})
+        self.assertEqual(driver.selected_jobs, ["203", "204", "205", "206", "207"])
+        self.assertEqual(sorted(bot.retry_queue), ["204", "205"])
+        self.assertEqual(self.get_outcome(bot, "204"), "failed_transient")
+        self.assertEqual(self.get_outcome(bot, "205"), "failed_transient")
+        self.assertEqual(self.get_outcome(bot, "207"), "failed_unknown_question")
+        self.assertEqual(bot.failed_applications["Company 207"]["cause"], "unknown_question")
+        self.assertEqual(bot.failed_applications["Company 207"]["job_id"], "207")
+        self.assertEqual(bot.metrics.wait_timeouts.values[None], 3)
+        self.assertGreaterEqual(driver.clock.elapsed, 30)
+        self.assertEqual(len(bot.last_successful_passes), 1)
+
+    def test_geo_id_lookup(self):
+        bot, driver = self.run_scenario("geo_id_lookup")
+        self.assertEqual(bot.geo_id_cache, {"Zug": "90009885"})
+        self.assertIn("https://www.linkedin.com/jobs/", driver.history)
+        self.assertIn("geoId=90009885", driver.history[-1])
+        self.assertEqual(self.get_outcome(bot, "301"), "no_easy_apply")
+
+        bot, driver = self.run_scenario("geo_id_lookup")
+        self.assertNotIn("https://www.linkedin.com/jobs/", driver.history)
+        self.assertEqual(driver.command_counts[Command.GET], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,19 @@
+import os
+import tempfile
 import unittest
+import urllib.request
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
-from easy_apply_linkedin import EasyApplyLinkedin
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from main import EasyApplyError, EasyApplyLinkedin
+from job_catalog import JobCatalog
 
 class TestEasyApplyLinkedin(unittest.TestCase):
     def setUp(self):
@@ -21,35 +34,498 @@ class TestEasyApplyLinkedin(unittest.TestCase):
                 "less_than_10_applicants": False
             }
         }
-        self.bot = EasyApplyLinkedin(self.data)
+        working_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(working_directory.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(working_directory.name)
+        self.mock_driver = MagicMock()
+        self.bot = EasyApplyLinkedin(self.data, driver_factory=lambda: self.mock_driver)
 
-    @patch('easy_apply_linkedin.webdriver.Firefox')
-    def test_login_linkedin(self, MockWebDriver):
-        mock_driver = MockWebDriver.return_value
-        mock_driver.find_element.return_value = MagicMock()
+    def test_login_linkedin(self):
+        self.mock_driver.find_element.return_value = MagicMock()
         self.bot.login_linkedin()
-        mock_driver.get.assert_called_with("https://www.linkedin.com/login")
-        self.assertTrue(mock_driver.find_element.called)
+        self.mock_driver.get.assert_called_with("https://www.linkedin.com/login")
+        self.assertTrue(self.mock_driver.find_element.called)
 
-    @patch('easy_apply_linkedin.webdriver.Firefox')
-    def test_construct_url(self, MockWebDriver):
+    def test_construct_url(self):
         url = self.bot.construct_url()
         self.assertIn("keywords=TypeScript%20OR%20Angular%20OR%20React", url)
         self.assertIn("geoId=106693272", url)
         self.assertIn("f_AL=true", url)
 
-    @patch('easy_apply_linkedin.webdriver.Firefox')
-    def test_apply_filters_and_search_no_results(self, MockWebDriver):
-        mock_driver = MockWebDriver.return_value
-        mock_driver.find_element.side_effect = NoSuchElementException
+    @patch('main.time.sleep')
+    def test_apply_filters_and_search_no_results(self, mock_sleep):
+        no_results_banner = MagicMock()
+        no_results_banner.is_displayed.side_effect = [True, False]
+        self.mock_driver.find_element.return_value = no_results_banner
         self.bot.apply_filters_and_search()
         self.assertEqual(self.bot.current_location_index, 1)
 
-    @patch('easy_apply_linkedin.webdriver.Firefox')
-    def test_log_error(self, MockWebDriver):
+    def test_log_error(self):
         self.bot.log_error("Test error")
         errors = self.bot.load_json(self.bot.ERROR_LOG_PATH)
         self.assertTrue(any("Test error" in v for v in errors.values()))
 
+    def test_record_seen_job(self):
+        with patch.object(self.bot, "save_json"):
+            self.bot.record_seen_job("123", "no_easy_apply")
+        self.assertTrue(self.bot.is_recently_seen("123"))
+        self.assertFalse(self.bot.is_recently_seen("456"))
+        self.assertFalse(self.bot.is_recently_seen(None))
+        self.bot.current_location_index = 1
+        self.assertFalse(self.bot.is_recently_seen("123"))
+
+    def test_cleanup_seen_jobs_cache(self):
+        now = datetime.now()
+        query_key = self.bot.get_query_key()
+        self.bot.seen_jobs = {
+            query_key: {
+                "old": {"outcome": "applied", "timestamp": str(now - timedelta(days=2))},
+                "older": {"outcome": "failed", "timestamp": str(now - timedelta(hours=2))},
+                "newer": {"outcome": "failed", "timestamp": str(now - timedelta(hours=1))},
+            }
+        }
+        self.bot.seen_jobs_max_entries = 1
+        with patch.object(self.bot, "save_json"):
+            self.bot.cleanup_seen_jobs_cache()
+        self.assertEqual(list(self.bot.seen_jobs[query_key]), ["newer"])
+
+    def test_get_prefetch_skip_outcome(self):
+        details = {"title": "Senior C++ Engineer", "company": "Acme", "easy_apply": True}
+        self.assertEqual(self.bot.get_prefetch_skip_outcome(details), "excluded")
+        details["title"] = "Senior TypeScript Engineer"
+        self.assertIsNone(self.bot.get_prefetch_skip_outcome(details))
+        details["easy_apply"] = False
+        self.assertEqual(self.bot.get_prefetch_skip_outcome(details), "no_easy_apply")
+        details["easy_apply"] = True
+        self.bot.applied_companies["Acme"] = str(datetime.now())
+        self.assertEqual(self.bot.get_prefetch_skip_outcome(details), "already_applied_company")
+
+    def test_skip_prefetched_job(self):
+        self.bot.prefetched_jobs["1"] = {"title": "Frontend Engineer", "company": "Acme", "easy_apply": False}
+        self.bot.prefetched_jobs["2"] = {"title": "Frontend Engineer", "company": "Acme", "easy_apply": True}
+        with patch.object(self.bot, "record_job_outcome") as record_job_outcome:
+            self.assertTrue(self.bot.skip_prefetched_job("1"))
+            self.assertFalse(self.bot.skip_prefetched_job("2"))
+            self.assertFalse(self.bot.skip_prefetched_job("3"))
+        record_job_outcome.assert_called_once_with("1", unittest.mock.ANY, "no_easy_apply")
+
+    def test_build_search_plan(self):
+        self.bot.locations = ["Switzerland", "Atlantis"]
+        self.bot.run_history = {
+            str(datetime.now()): {"search": "Switzerland", "seconds": 100, "jobs": 5},
+            str(datetime.now() - timedelta(days=1)): {"search": "Switzerland", "seconds": 200, "jobs": 7},
+        }
+        plan = self.bot.build_search_plan()
+        self.assertEqual([search["search"] for search in plan["searches"]], ["Switzerland", "Atlantis"])
+        self.assertIn("geoId=106693272", plan["searches"][0]["url"])
+        self.assertEqual(plan["missingGeoIds"], ["Atlantis"])
+        self.assertEqual(plan["estimatedSeconds"], 300)
+        self.assertEqual(self.bot.current_location_index, 0)
+
+    def test_plan_only_has_no_side_effects(self):
+        plan_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(plan_directory.cleanup)
+        os.chdir(plan_directory.name)
+        factory = MagicMock()
+        bot = EasyApplyLinkedin(dict(self.data, metricsPort=0), driver_factory=factory, plan_only=True)
+        bot.write_search_plan()
+        bot.close_session()
+        self.assertIsNone(bot.metrics_server)
+        self.assertFalse(os.path.exists(bot.JOB_CATALOG_PATH))
+        self.assertTrue(os.path.exists(bot.SEARCH_PLAN_PATH))
+        factory.assert_not_called()
+
+    @patch('main.webdriver.Firefox')
+    def test_driver_is_created_lazily(self, MockWebDriver):
+        factory = MagicMock(return_value=self.mock_driver)
+        bot = EasyApplyLinkedin(self.data, driver_factory=factory)
+        self.assertFalse(bot.driver_started)
+        bot.construct_url()
+        factory.assert_not_called()
+        self.assertIs(bot.driver, self.mock_driver)
+        self.assertIs(bot.driver, self.mock_driver)
+        factory.assert_called_once_with()
+        MockWebDriver.assert_not_called()
+
+    def test_driver_prelaunch(self):
+        factory = MagicMock(return_value=self.mock_driver)
+        bot = EasyApplyLinkedin(self.data, driver_factory=factory, prelaunch=True)
+        self.assertTrue(bot.driver_started)
+        self.assertIs(bot.driver, self.mock_driver)
+        factory.assert_called_once_with()
+        self.assertIn("browser", bot.startup_timings)
+
+    def test_close_session_without_driver(self):
+        factory = MagicMock()
+        bot = EasyApplyLinkedin(self.data, driver_factory=factory)
+        bot.close_session()
+        factory.assert_not_called()
+
+    def mock_easy_apply_steps(self, steps):
+        remaining_steps = iter(steps)
+        def execute_script(script, *args):
+            if script == EasyApplyLinkedin.EASY_APPLY_STEP_SCRIPT:
+                return next(remaining_steps)
+            return None
+        self.mock_driver.execute_script.side_effect = execute_script
+
+    @patch('main.time.sleep')
+    def test_handle_easy_apply_state_machine(self, mock_sleep):
+        next_button, review_button, submit_button = MagicMock(), MagicMock(), MagicMock()
+        text_input = MagicMock()
+        field = {"element": MagicMock(), "input": text_input, "label": "City", "kind": "text", "value": "Zurich"}
+        self.mock_easy_apply_steps([
+            {"kind": "next", "progress": 0, "button": next_button, "fields": [field]},
+            {"kind": "review", "progress": 50, "button": review_button, "fields": []},
+            {"kind": "submit", "progress": 100, "button": submit_button, "fields": []},
+        ])
+        self.bot.context_data["user_inputs"]["Switzerland"] = {"City": "Zurich"}
+        with patch.object(self.bot, "handle_done_button") as handle_done_button:
+            self.bot.handle_easy_apply()
+        handle_done_button.assert_called_once_with()
+        clicked = [
+            call.args[1] for call in self.mock_driver.execute_script.call_args_list
+            if call.args[0] == "arguments[0].click();"
+        ]
+        self.assertEqual(clicked, [next_button, review_button, submit_button])
+        text_input.send_keys.assert_not_called()
+        self.mock_driver.find_element.return_value.find_element.assert_not_called()
+
+    @patch('main.time.sleep')
+    def test_handle_easy_apply_stops_when_step_does_not_advance(self, mock_sleep):
+        next_button = MagicMock()
+        step = {"kind": "next", "progress": 25, "button": next_button, "fields": []}
+        self.mock_easy_apply_steps([step, dict(step)])
+        with patch.object(self.bot, "close_application_modal") as close_application_modal:
+            with self.assertRaises(EasyApplyError) as raised:
+                self.bot.handle_easy_apply()
+        close_application_modal.assert_called_once_with()
+        self.assertEqual(raised.exception.cause, EasyApplyLinkedin.FAILURE_UNKNOWN_QUESTION)
+
+    def test_form_plan_cache(self):
+        select_input = MagicMock()
+        fields = [
+            {"element": MagicMock(), "input": select_input, "label": "Years of experience", "kind": "select",
+             "value": "", "typeahead": False},
+        ]
+        self.bot.context_data["user_inputs"]["Switzerland"] = {"Years of experience": "5"}
+        self.bot.fill_form(MagicMock(), fields)
+        self.assertEqual(self.bot.form_plan_stats, {"hits": 0, "misses": 1})
+        self.assertEqual(len(self.bot.form_plans), 1)
+
+        self.mock_driver.reset_mock()
+        select_input.reset_mock()
+        self.bot.fill_form(MagicMock(), fields)
+        self.assertEqual(self.bot.form_plan_stats, {"hits": 1, "misses": 1})
+        self.mock_driver.execute_script.assert_called_once_with(
+            EasyApplyLinkedin.FORM_PLAN_SCRIPT, [[fields[0]["element"], select_input, "select", "5"]]
+        )
+        select_input.find_elements.assert_not_called()
+
+        fields[0]["label"] = "Years of experience with React"
+        self.bot.context_data["user_inputs"]["Switzerland"]["Years of experience with React"] = "3"
+        self.bot.fill_form(MagicMock(), fields)
+        self.assertEqual(self.bot.form_plan_stats, {"hits": 1, "misses": 2})
+
+    def test_cleanup_form_plan_cache(self):
+        now = datetime.now()
+        self.bot.form_plans = {
+            "stale": {"fields": [], "last_used": str(now - timedelta(days=60))},
+            "old": {"fields": [], "last_used": str(now - timedelta(days=2))},
+            "recent": {"fields": [], "last_used": str(now - timedelta(days=1))},
+        }
+        with patch.object(EasyApplyLinkedin, "FORM_PLAN_MAX_ENTRIES", 1):
+            self.bot.cleanup_form_plan_cache()
+        self.assertEqual(list(self.bot.form_plans), ["recent"])
+
+    def test_record_job_outcome_updates_metrics(self):
+        details = {"title": "", "company": "", "location": "", "posted": "", "easy_apply": None,
+                   "description_hash": None}
+        self.bot.record_job_outcome("1", details, "applied")
+        self.bot.record_job_outcome("2", details, "failed_transient")
+        self.bot.record_job_outcome("3", details, "no_easy_apply")
+        self.assertEqual(self.bot.metrics.jobs_applied.values[None], 1)
+        self.assertEqual(self.bot.metrics.jobs_failed.values[None], 1)
+        self.assertEqual(self.bot.metrics.jobs_skipped.values, {"no_easy_apply": 1})
+
+    def test_wait_counts_timeouts(self):
+        self.mock_driver.find_element.side_effect = NoSuchElementException
+        with patch('selenium.webdriver.support.wait.time.monotonic', side_effect=[0, 0, 20]), \
+                patch('selenium.webdriver.support.wait.time.sleep'):
+            with self.assertRaises(TimeoutException):
+                self.bot.wait(10).until(EC.presence_of_element_located((By.NAME, "session_key")))
+        self.assertEqual(self.bot.metrics.wait_timeouts.values[None], 1)
+
+    def test_metrics_endpoint(self):
+        self.data["metricsPort"] = 0
+        bot = EasyApplyLinkedin(self.data, driver_factory=lambda: self.mock_driver)
+        self.addCleanup(bot.close_session)
+        self.mock_driver.execute.return_value = {"value": None}
+        bot.driver.execute("getCurrentUrl")
+        bot.metrics.jobs_skipped.inc(label="excluded")
+        with urllib.request.urlopen(f"http://127.0.0.1:{bot.metrics_server.port}/metrics") as response:
+            body = response.read().decode("utf-8")
+        self.assertIn('easyapply_jobs_skipped_total{reason="excluded"} 1', body)
+        self.assertIn('easyapply_webdriver_command_seconds_count{command="getCurrentUrl"} 1', body)
+        self.assertIn("# TYPE easyapply_webdriver_command_seconds histogram", body)
+
+    def test_construct_url_incremental_window(self):
+        query_key = self.bot.get_query_key()
+        self.bot.last_successful_passes[query_key] = str(datetime.now() - timedelta(hours=2))
+        self.assertNotIn("f_TPR", self.bot.construct_url())
+        self.bot.incremental = True
+        self.assertIn(f"f_TPR=r{2 * 3600 + EasyApplyLinkedin.TIME_POSTED_MARGIN_SECONDS}", self.bot.construct_url())
+        self.bot.current_location_index = 1
+        self.assertNotIn("f_TPR", self.bot.construct_url())
+        self.bot.current_location_index = 0
+        self.bot.keywords = "Vue"
+        self.assertNotIn("f_TPR", self.bot.construct_url())
+        self.bot.filters["timePostedRange"] = ["Past 24 hours"]
+        self.bot.last_successful_passes[self.bot.get_query_key()] = str(datetime.now() - timedelta(hours=2))
+        self.assertIn(f"f_TPR=r{2 * 3600 + EasyApplyLinkedin.TIME_POSTED_MARGIN_SECONDS}", self.bot.construct_url())
+        self.bot.last_successful_passes[self.bot.get_query_key()] = str(datetime.now() - timedelta(days=3))
+        self.assertIn("f_TPR=r86400", self.bot.construct_url())
+
+    def test_log_successful_pass(self):
+        self.bot.log_successful_pass()
+        self.assertEqual(self.bot.last_successful_passes, {})
+        self.bot.pass_started_at = datetime.now() - timedelta(minutes=5)
+        self.bot.log_successful_pass()
+        saved = self.bot.load_json(EasyApplyLinkedin.LAST_SUCCESSFUL_PASSES_PATH)
+        self.assertEqual(saved, {self.bot.get_query_key(): str(self.bot.pass_started_at)})
+
+    def test_classify_failure(self):
+        self.assertEqual(self.bot.classify_failure(TimeoutException()), EasyApplyLinkedin.FAILURE_TRANSIENT)
+        self.assertEqual(
+            self.bot.classify_failure(StaleElementReferenceException()), EasyApplyLinkedin.FAILURE_TRANSIENT
+        )
+        self.assertEqual(self.bot.classify_failure(ValueError()), EasyApplyLinkedin.FAILURE_PERMANENT)
+        self.assertEqual(
+            self.bot.classify_failure(EasyApplyError(EasyApplyLinkedin.FAILURE_UNKNOWN_QUESTION, "stuck")),
+            EasyApplyLinkedin.FAILURE_UNKNOWN_QUESTION,
+        )
+
+    def test_retry_queue_backoff_and_cap(self):
+        self.bot.log_failed_application("Acme", EasyApplyLinkedin.FAILURE_TRANSIENT, "1", "timeout")
+        entry = self.bot.retry_queue["1"]
+        self.assertEqual(entry["attempts"], 1)
+        first_delay = datetime.fromisoformat(entry["next_attempt"]) - datetime.now()
+        self.assertAlmostEqual(first_delay.total_seconds(), 30 * 60, delta=5)
+        self.assertEqual(self.bot.get_due_retries(), [])
+
+        self.bot.log_failed_application("Acme", EasyApplyLinkedin.FAILURE_TRANSIENT, "1", "timeout")
+        second_delay = datetime.fromisoformat(self.bot.retry_queue["1"]["next_attempt"]) - datetime.now()
+        self.assertAlmostEqual(second_delay.total_seconds(), 60 * 60, delta=5)
+
+        self.bot.log_failed_application("Acme", EasyApplyLinkedin.FAILURE_TRANSIENT, "1", "timeout")
+        self.bot.log_failed_application("Acme", EasyApplyLinkedin.FAILURE_TRANSIENT, "1", "timeout")
+        self.assertNotIn("1", self.bot.retry_queue)
+
+        self.bot.log_failed_application("Globex", EasyApplyLinkedin.FAILURE_PERMANENT, "2", "broken form")
+        self.assertNotIn("2", self.bot.load_json(EasyApplyLinkedin.RETRY_QUEUE_PATH))
+        failed = self.bot.load_json(EasyApplyLinkedin.FAILED_APPLICATIONS_LOG_PATH)
+        self.assertEqual(failed["Globex"]["cause"], EasyApplyLinkedin.FAILURE_PERMANENT)
+        self.assertEqual(failed["Globex"]["job_id"], "2")
+
+    @patch('main.time.sleep')
+    def test_run_daemon_survives_failed_pass(self, mock_sleep):
+        mock_sleep.side_effect = [None, KeyboardInterrupt]
+        crashed_driver, new_driver = MagicMock(), MagicMock()
+        factory = MagicMock(side_effect=[crashed_driver, new_driver])
+        bot = EasyApplyLinkedin(self.data, driver_factory=factory)
+        outcomes = iter([WebDriverException("browser crashed"), None])
+        def find_offers_side_effect():
+            bot.driver.current_url
+            outcome = next(outcomes)
+            if outcome is not None:
+                raise outcome
+        with patch.object(bot, "login_linkedin") as login_linkedin, \
+                patch.object(bot, "find_offers", side_effect=find_offers_side_effect) as find_offers:
+            with self.assertRaises(KeyboardInterrupt):
+                bot.run_daemon()
+        self.assertEqual(find_offers.call_count, 2)
+        self.assertEqual(factory.call_count, 2)
+        crashed_driver.quit.assert_called_once_with()
+        self.assertIs(bot.driver, new_driver)
+        self.assertEqual(login_linkedin.call_count, 2)
+        errors = bot.load_json(bot.ERROR_LOG_PATH)
+        self.assertTrue(any("browser crashed" in v for v in errors.values()))
+
+    @patch('main.time.sleep')
+    def test_drain_retry_queue(self, mock_sleep):
+        self.bot.retry_queue = {
+            "1": {"company": "Acme", "search": "Belgium", "error": "timeout", "attempts": 1,
+                  "next_attempt": str(datetime.now() - timedelta(minutes=1))},
+            "2": {"company": "Globex", "search": "Belgium", "error": "timeout", "attempts": 1,
+                  "next_attempt": str(datetime.now() + timedelta(minutes=1))},
+        }
+        self.mock_driver.execute_script.return_value = {}
+        with patch.object(self.bot, "handle_easy_apply") as handle_easy_apply:
+            self.bot.drain_retry_queue()
+        handle_easy_apply.assert_called_once_with()
+        self.mock_driver.get.assert_called_once_with("https://www.linkedin.com/jobs/view/1/")
+        self.assertEqual(list(self.bot.retry_queue), ["2"])
+        self.assertIn("Acme", self.bot.applied_companies)
+        self.assertEqual(self.bot.current_location_index, 0)
+
+    def test_drain_retry_queue_drops_already_applied_company(self):
+        due = str(datetime.now() - timedelta(minutes=1))
+        self.bot.applied_companies = {"Acme": str(datetime.now())}
+        self.bot.job_catalog.record_job("2", "applied", company="Globex")
+        self.bot.retry_queue = {
+            "1": {"company": "Acme", "search": "Belgium", "error": "timeout", "attempts": 1, "next_attempt": due},
+            "2": {"company": "Globex", "search": "Belgium", "error": "timeout", "attempts": 1, "next_attempt": due},
+        }
+        with patch.object(self.bot, "open_easy_apply_modal") as open_easy_apply_modal:
+            self.bot.drain_retry_queue()
+        open_easy_apply_modal.assert_not_called()
+        self.mock_driver.get.assert_not_called()
+        self.assertEqual(self.bot.retry_queue, {})
+        self.assertEqual(self.bot.load_json(EasyApplyLinkedin.RETRY_QUEUE_PATH), {})
+
+    def test_webdriver_tracer(self):
+        self.data["traceWebDriver"] = True
+        self.data["traceFoldedPath"] = "trace.folded"
+        bot = EasyApplyLinkedin(self.data, driver_factory=lambda: self.mock_driver)
+        self.mock_driver.execute.return_value = {"value": None}
+        bot.tracer.mark_job()
+        bot.driver.execute("findElement", {"using": "css selector", "value": "li"})
+        bot.driver.execute("findElement", {"using": "css selector", "value": "li"})
+        bot.driver.execute("executeScript", {"script": "", "args": []})
+        self.assertEqual(bot.tracer.commands["findElement"][0], 2)
+        self.assertTrue(all(call_site.startswith("unit_tests.py:") for call_site, _ in bot.tracer.call_sites))
+        self.assertIn("3.0 commands per job over 1 jobs", bot.tracer.report())
+        bot.close_session()
+        with open("trace.folded") as folded:
+            lines = folded.read().splitlines()
+        self.assertTrue(any(line.split(" ")[0].endswith("test_webdriver_tracer;findElement") for line in lines))
+
+    def test_learn_geo_id(self):
+        self.mock_driver.current_url = "https://www.linkedin.com/jobs/search/?keywords=React"
+        self.assertIsNone(self.bot.learn_geo_id("Ireland"))
+        self.assertIsNone(self.bot.geo_id_cache["Ireland"]["geoId"])
+        self.assertIsNone(self.bot.resolve_geo_id("Ireland"))
+        self.mock_driver.current_url = "https://www.linkedin.com/jobs/search/?geoId=104738515&keywords=React"
+        self.assertEqual(self.bot.learn_geo_id("Ireland"), "104738515")
+        self.assertEqual(self.bot.load_json(EasyApplyLinkedin.GEO_ID_CACHE_PATH), {"Ireland": "104738515"})
+        self.bot.locations = ["Ireland"]
+        self.assertIn("geoId=104738515", self.bot.construct_url())
+
+    def test_ensure_geo_id_retries_failed_lookup_after_ttl(self):
+        with patch.object(self.bot, "search_via_ui") as search_via_ui:
+            self.assertEqual(self.bot.ensure_geo_id("Switzerland"), "106693272")
+            self.bot.geo_id_cache["Ireland"] = "104738515"
+            self.assertEqual(self.bot.ensure_geo_id("Ireland"), "104738515")
+            search_via_ui.assert_not_called()
+
+            self.bot.geo_id_cache["Remote"] = {"geoId": None, "checked": str(datetime.now() - timedelta(hours=1))}
+            self.assertIsNone(self.bot.ensure_geo_id("Remote"))
+            search_via_ui.assert_not_called()
+            self.bot.geo_id_cache["Remote"]["checked"] = str(datetime.now() - timedelta(hours=25))
+            self.assertIsNone(self.bot.ensure_geo_id("Remote"))
+            search_via_ui.assert_called_once_with("Remote")
+
+            search_via_ui.side_effect = TimeoutException("slow page")
+            self.assertIsNone(self.bot.ensure_geo_id("Atlantis"))
+            self.assertIsNone(self.bot.ensure_geo_id("Atlantis"))
+            search_via_ui.assert_called_with("Atlantis")
+            self.assertEqual(search_via_ui.call_count, 2)
+            self.assertIsNone(self.bot.load_json(EasyApplyLinkedin.GEO_ID_CACHE_PATH)["Atlantis"]["geoId"])
+
+    def test_rank_job_cards(self):
+        self.data["ranking"] = {
+            "keywordWeights": {"React": 3, "TypeScript": 1},
+            "titleMatchWeight": 2,
+            "workplaceWeights": {"Remote": 2},
+            "applicantWeight": -0.01,
+        }
+        bot = EasyApplyLinkedin(self.data, driver_factory=lambda: self.mock_driver)
+        job_cards = [
+            {"id": "1", "title": "Java Developer", "text": "Java Developer\nAcme\nBerlin (On-site)\n12 applicants"},
+            {"id": "2", "title": "React Engineer", "text": "React Engineer\nGlobex\nZurich (Remote)\n"},
+            {"id": "3", "title": "Frontend Engineer", "text": "Frontend Engineer\nTypeScript, React (Hybrid)\n"
+                                                            "1,200 applicants"},
+        ]
+        self.assertEqual(bot.score_job_cards(job_cards), [-0.12, 3 + 6 + 2, 4 - 12])
+        self.assertEqual(bot.rank_job_cards(job_cards), [1, 0, 2])
+        self.assertEqual(len(bot.job_scores), 3)
+        self.assertEqual(self.bot.rank_job_cards(job_cards), [0, 1, 2])
+
+    @patch('main.time.sleep')
+    def test_rank_job_cards_renders_cards_and_falls_back_to_details(self, mock_sleep):
+        self.data["ranking"] = {"keywordWeights": {"React": 3}, "applicantWeight": -0.01}
+        bot = EasyApplyLinkedin(self.data, driver_factory=lambda: self.mock_driver)
+        self.mock_driver.execute_script.return_value = {
+            "title": "React Engineer",
+            "company": "Acme",
+            "primaryDescription": "Zurich, Switzerland · 2 days ago · Over 1,000 applicants",
+        }
+        details = bot.get_job_details()
+        self.assertEqual(details["applicants"], 1000)
+        bot.record_job_outcome("2", details, "failed_transient")
+        self.assertEqual(bot.job_catalog.get_job("2")["company"], "Acme")
+
+        job_list_container = MagicMock()
+        self.mock_driver.execute_script.reset_mock()
+        self.mock_driver.execute_script.side_effect = [3, [
+            {"id": "1", "title": "React Engineer", "text": "React Engineer\nGlobex\n12 applicants"},
+            {"id": "2", "title": "", "text": ""},
+            {"id": "3", "title": "", "text": ""},
+        ]]
+        job_cards = bot.get_job_cards(job_list_container)
+        self.assertEqual(
+            [call.args[0] for call in self.mock_driver.execute_script.call_args_list],
+            [EasyApplyLinkedin.RENDER_JOB_CARDS_SCRIPT, EasyApplyLinkedin.JOB_CARDS_SCRIPT],
+        )
+        self.assertEqual(bot.score_job_cards(job_cards), [3 + 6 - 0.12, -10, 0])
+        self.assertEqual(bot.rank_job_cards(job_cards), [0, 2, 1])
+
+    def test_application_budget(self):
+        self.bot.application_budget = 1
+        self.assertFalse(self.bot.budget_exhausted())
+        details = {"title": "", "company": "", "location": "", "posted": "", "easy_apply": None,
+                   "description_hash": None}
+        self.bot.record_job_outcome("1", details, "applied")
+        self.assertTrue(self.bot.budget_exhausted())
+        self.bot.application_budget = None
+        self.assertFalse(self.bot.budget_exhausted())
+
+class TestJobCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = JobCatalog(":memory:")
+
+    def tearDown(self):
+        self.catalog.close()
+
+    def test_record_job_is_batched(self):
+        self.catalog.record_job("1", "applied", title="Engineer", company="Acme", description_hash="abc")
+        count = self.catalog.connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        self.assertEqual(count, 0)
+        self.assertEqual(self.catalog.get_job("1")["company"], "Acme")
+        self.catalog.flush()
+        count = self.catalog.connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        self.assertEqual(count, 1)
+
+    def test_is_unchanged(self):
+        self.catalog.record_job("1", "no_easy_apply", description_hash="abc")
+        self.catalog.record_job("2", "failed_transient", description_hash="def")
+        self.catalog.record_job("4", "failed_permanent", description_hash="ghi")
+        self.catalog.flush()
+        self.assertTrue(self.catalog.is_unchanged("1", "abc"))
+        self.assertTrue(self.catalog.is_unchanged("4", "ghi"))
+        self.assertFalse(self.catalog.is_unchanged("1", "changed"))
+        self.assertFalse(self.catalog.is_unchanged("2", "def"))
+        self.assertFalse(self.catalog.is_unchanged("3", "abc"))
+
+    def test_report(self):
+        self.catalog.record_job("1", "applied", company="Acme")
+        self.catalog.record_job("2", "applied", company="Acme")
+        self.catalog.record_job("3", "failed_unknown_question", company="Globex")
+        report = self.catalog.report()
+        self.assertEqual(report["total_jobs"], 3)
+        self.assertEqual(report["outcomes"], {"applied": 2, "failed_unknown_question": 1})
+        self.assertEqual(report["top_applied_companies"], {"Acme": 2})
+
 if __name__ == "__main__":
     unittest.main()
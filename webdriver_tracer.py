@@ -0,0 +1,80 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+
+class WebDriverTracer:
+    SELENIUM_PATH_PART = f"{os.sep}selenium{os.sep}"
+
+    def __init__(self):
+        self.commands = {}
+        self.call_sites = {}
+        self.folded_stacks = {}
+        self.jobs = 0
+        self.ignored_files = {os.path.abspath(__file__)}
+
+    def attach(self, driver):
+        execute = driver.execute
+        record = self.record
+
+        def traced_execute(driver_command, params=None):
+            started = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            finally:
+                record(driver_command, time.perf_counter() - started, sys._getframe(1))
+
+        driver.execute = traced_execute
+        return driver
+
+    def mark_job(self):
+        self.jobs += 1
+
+    def is_ignored(self, frame):
+        filename = frame.f_code.co_filename
+        return self.SELENIUM_PATH_PART in filename or os.path.abspath(filename) in self.ignored_files
+
+    def record(self, command, elapsed, frame):
+        while frame is not None and self.is_ignored(frame):
+            frame = frame.f_back
+        call_site = "<unknown>"
+        stack = []
+        if frame is not None:
+            call_site = f"{Path(frame.f_code.co_filename).name}:{frame.f_lineno} {frame.f_code.co_name}"
+            while frame is not None:
+                if not self.is_ignored(frame):
+                    stack.append(frame.f_code.co_name)
+                frame = frame.f_back
+
+        totals = self.commands.setdefault(command, [0, 0.0])
+        totals[0] += 1
+        totals[1] += elapsed
+        totals = self.call_sites.setdefault((call_site, command), [0, 0.0])
+        totals[0] += 1
+        totals[1] += elapsed
+        folded = ";".join(reversed(stack)) + f";{command}" if stack else command
+        self.folded_stacks[folded] = self.folded_stacks.get(folded, 0) + elapsed
+
+    def report(self, top=10):
+        count = sum(totals[0] for totals in self.commands.values())
+        elapsed = sum(totals[1] for totals in self.commands.values())
+        lines = [f"WebDriver commands: {count} in {elapsed:.2f} s"]
+        if self.jobs:
+            lines[0] += f" ({count / self.jobs:.1f} commands per job over {self.jobs} jobs)"
+        lines.append("By command:")
+        for command, (command_count, command_elapsed) in sorted(
+            self.commands.items(), key=lambda item: item[1][1], reverse=True
+        ):
+            lines.append(f"  {command}: {command_count} calls, {command_elapsed:.2f} s")
+        lines.append(f"Top {top} call sites:")
+        for (call_site, command), (site_count, site_elapsed) in sorted(
+            self.call_sites.items(), key=lambda item: item[1][1], reverse=True
+        )[:top]:
+            lines.append(f"  {call_site} [{command}]: {site_count} calls, {site_elapsed:.2f} s")
+        return "\n".join(lines)
+
+    def write_folded(self, path):
+        with Path(path).open("w") as file:
+            for stack, elapsed in sorted(self.folded_stacks.items()):
+                file.write(f"{stack} {round(elapsed * 1_000_000)}\n")